@@ -6,7 +6,7 @@
 
 from .rule import RegexRule, RuleFileManager
 from .file_manager import FileManager
-from .renamer import MediaRenamer
+from .renamer import MediaRenamer, RenameResult
 from .auto_matcher import RuleMatcher
 
 __all__ = [
@@ -14,5 +14,6 @@ __all__ = [
     'RuleFileManager', 
     'FileManager',
     'MediaRenamer',
+    'RenameResult',
     'RuleMatcher'
 ]
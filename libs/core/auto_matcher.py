@@ -5,12 +5,38 @@
 负责分析文件名并自动选择最合适的规则
 """
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
 from libs.core.rule import RegexRule
 
+# 文件数达到该阈值才值得启动进程池（进程创建和序列化有固定成本）
+_PARALLEL_THRESHOLD = 2048
+
+# 同一部剧的文件名共享前缀，按前3个分词记忆最佳规则
+_PREFIX_SPLIT_RX = re.compile(r'[\s._\-\[\]]+')
+
+# 进程池工作进程的全局状态（由 _pool_init 初始化一次，避免逐任务传输规则）
+_POOL_MATCHER: Optional['RuleMatcher'] = None
+_POOL_RULES: List[RegexRule] = []
+
+
+def _pool_init(rules: List[RegexRule]):
+    """进程池初始化：每个工作进程持有一份规则和匹配器"""
+    global _POOL_MATCHER, _POOL_RULES
+    _POOL_MATCHER = RuleMatcher()
+    _POOL_RULES = rules
+
+
+def _match_one(file_path: Path) -> Tuple[str, Optional[str], float, Dict, Path]:
+    """工作进程：匹配单个文件，规则以名称返回（对象在主进程中回查）"""
+    filename = file_path.name
+    best_rule, score, match_info = _POOL_MATCHER.find_best_rule(filename, _POOL_RULES)
+    return filename, (best_rule.name if best_rule else None), score, match_info, file_path
+
 
 class RuleMatcher:
     """规则匹配器"""
@@ -104,22 +130,24 @@ class RuleMatcher:
         
         return features
     
-    def calculate_rule_score(self, rule: RegexRule, filename: str) -> float:
+    def calculate_rule_score(self, rule: RegexRule, filename: str, match_result: Optional[Dict] = None) -> float:
         """
         计算规则匹配分数
-        
+
         Args:
             rule: 规则对象
             filename: 文件名
-            
+            match_result: 预先计算的匹配结果，传入后不再重新匹配
+
         Returns:
             匹配分数 (0-100)
         """
         # 基础分数
         base_score = self.rule_weights.get(rule.name, 5)
-        
-        # 尝试匹配
-        match_result = rule.match(filename)
+
+        # 尝试匹配（调用方已匹配过时直接复用结果）
+        if match_result is None:
+            match_result = rule.match(filename)
         if not match_result:
             return 0.0
         
@@ -195,40 +223,136 @@ class RuleMatcher:
         best_match_info = {}
         
         for rule in rules:
-            score = self.calculate_rule_score(rule, filename)
+            # 字面量预过滤：缺少必然子串的文件名直接跳过正则引擎
+            required = getattr(rule, 'required_literal', "")
+            if required and required not in filename:
+                continue
+            # 每条规则只匹配一次，打分和结果记录共用同一个匹配
+            match_result = rule.match(filename)
+            if not match_result:
+                continue
+            score = self.calculate_rule_score(rule, filename, match_result)
             if score > best_score:
                 best_score = score
                 best_rule = rule
-                best_match_info = rule.match(filename) or {}
-        
+                best_match_info = match_result
+
         return best_rule, best_score, best_match_info
     
+    def build_combined(self, rules: List[RegexRule]) -> Optional['re.Pattern']:
+        """
+        构建所有规则模式的合并交替正则
+
+        逐条规则打分前先用合并正则做一次 C 级匹配，任何规则都匹配不到的
+        文件名可以直接跳过整个打分循环。
+
+        Args:
+            rules: 规则列表
+
+        Returns:
+            合并后的正则对象，规则列表为空或模式无法合并时返回None
+        """
+        key = tuple(rule.pattern for rule in rules)
+        if getattr(self, '_combined_key', None) != key:
+            try:
+                self._combined_rx = re.compile("|".join(f"(?:{p})" for p in key)) if key else None
+            except re.error:
+                # 个别模式合并后不合法（如重复的命名分组），退回无预过滤
+                self._combined_rx = None
+            self._combined_key = key
+        return self._combined_rx
+
     def auto_match_files(self, file_list: List[Path], rules: List[RegexRule]) -> Dict[str, Dict]:
         """
         自动匹配文件列表
-        
+
         Args:
             file_list: 文件列表
             rules: 规则列表
-            
+
         Returns:
             匹配结果字典
         """
+        # 大批量时分进程并行匹配，失败（如规则不可序列化）回退串行
+        if len(file_list) >= _PARALLEL_THRESHOLD:
+            try:
+                return self.auto_match_files_parallel(file_list, rules)
+            except Exception:
+                pass
+
         results = {}
-        
+        combined_rx = self.build_combined(rules)
+        # 本批次内的前缀记忆：同一剧集的文件直接复用最佳规则
+        prefix_cache: Dict[str, Tuple[Optional[RegexRule], float]] = {}
+
         for file_path in file_list:
             filename = file_path.name
+
+            # 合并正则快速排除：没有任何规则能匹配时跳过逐条打分
+            if combined_rx is not None and not combined_rx.search(filename):
+                results[filename] = {
+                    'rule': None,
+                    'score': 0.0,
+                    'match_info': {},
+                    'file_path': file_path
+                }
+                continue
+
+            prefix = ' '.join(_PREFIX_SPLIT_RX.split(filename)[:3])
+            cached = prefix_cache.get(prefix)
+            if cached is not None and cached[0] is not None:
+                # 缓存的规则必须真的匹配当前文件名才可复用
+                best_rule, score = cached
+                match_info = best_rule.match(filename)
+                if match_info is not None:
+                    results[filename] = {
+                        'rule': best_rule,
+                        'score': score,
+                        'match_info': match_info,
+                        'file_path': file_path
+                    }
+                    continue
+
             best_rule, score, match_info = self.find_best_rule(filename, rules)
-            
+            prefix_cache[prefix] = (best_rule, score)
+
             results[filename] = {
                 'rule': best_rule,
                 'score': score,
                 'match_info': match_info,
                 'file_path': file_path
             }
-        
+
         return results
     
+    def auto_match_files_parallel(self, file_list: List[Path], rules: List[RegexRule]) -> Dict[str, Dict]:
+        """
+        进程池并行匹配文件列表（供大目录使用）
+
+        Args:
+            file_list: 文件列表
+            rules: 规则列表
+
+        Returns:
+            匹配结果字典，与 auto_match_files 相同
+        """
+        rules_by_name = {rule.name: rule for rule in rules}
+        results = {}
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 initializer=_pool_init,
+                                 initargs=(rules,)) as executor:
+            for filename, rule_name, score, match_info, file_path in executor.map(
+                    _match_one, file_list, chunksize=128):
+                results[filename] = {
+                    'rule': rules_by_name.get(rule_name),
+                    'score': score,
+                    'match_info': match_info,
+                    'file_path': file_path
+                }
+
+        return results
+
     def get_rule_suggestions(self, filename: str, rules: List[RegexRule], top_n: int = 3) -> List[Tuple[RegexRule, float]]:
         """
         获取规则建议（按分数排序）
@@ -31,14 +31,19 @@ class FileManager:
         """
         if not directory or not os.path.exists(directory):
             return []
-        
+
+        # os.scandir 复用 readdir 缓存的类型信息，避免逐文件 stat；
+        # 只为命中的媒体文件构造 Path 对象
         media_files = []
-        for file_path in Path(directory).iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_MEDIA_EXTENSIONS:
-                media_files.append(file_path)
-        
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # 与 Path.suffix 语义一致：必须有点且点前有内容
+                stem, sep, ext = entry.name.rpartition('.')
+                if sep and stem and f".{ext.lower()}" in SUPPORTED_MEDIA_EXTENSIONS and entry.is_file():
+                    media_files.append(Path(entry.path))
+
         return media_files
-    
+
     @staticmethod
     def scan_video_files(directory: str) -> List[Path]:
         """
@@ -121,10 +126,12 @@ class FileManager:
             if name_without_ext in reserved_names:
                 return False, f"文件名使用了Windows保留名称: {name_without_ext}"
             
-            # 检查是否已存在
-            if new_path.exists() and new_path != file_path:
+            # 检查是否已存在（lexists只做一次lstat，且不跟随符号链接；
+            # 不能改为 try-rename 捕获 FileExistsError：POSIX 的 rename
+            # 会静默覆盖已存在的目标）
+            if new_path != file_path and os.path.lexists(new_path):
                 return False, "目标文件已存在"
-            
+
             # 检查文件是否被占用
             try:
                 with open(file_path, 'r+b') as f:
@@ -133,9 +140,9 @@ class FileManager:
                 return False, "文件被占用或无权限访问"
             except Exception as e:
                 return False, f"文件访问错误: {e}"
-            
+
             # 执行重命名
-            file_path.rename(new_path)
+            os.rename(file_path, new_path)
             return True, "成功"
             
         except PermissionError as e:
@@ -191,6 +198,52 @@ class FileManager:
             print(f"记录重命名失败: {e}")
             return False
     
+    @staticmethod
+    def log_rename_bulk(directory: str, entries: List[Dict]) -> bool:
+        """
+        批量记录重命名操作（整个批次只读写一次记录文件）
+
+        Args:
+            directory: 文件所在目录
+            entries: 记录列表，每项包含 old_name/new_name/rule_name/status/reason
+
+        Returns:
+            是否记录成功
+        """
+        if not entries:
+            return True
+
+        try:
+            log_file = Path(directory) / RENAME_LOG_NAME
+
+            # 读取现有记录
+            rename_log = []
+            if log_file.exists():
+                with open(log_file, 'r', encoding='utf-8') as f:
+                    rename_log = json.load(f)
+
+            # 追加整批记录
+            timestamp = datetime.now().isoformat()
+            for entry in entries:
+                rename_log.append({
+                    'timestamp': timestamp,
+                    'old_name': entry['old_name'],
+                    'new_name': entry['new_name'],
+                    'rule_name': entry.get('rule_name'),
+                    'directory': directory,
+                    'status': entry.get('status', '成功'),
+                    'reason': entry.get('reason') or "无"
+                })
+
+            # 保存记录
+            with open(log_file, 'w', encoding='utf-8') as f:
+                json.dump(rename_log, f, ensure_ascii=False, indent=2)
+
+            return True
+        except Exception as e:
+            print(f"批量记录重命名失败: {e}")
+            return False
+
     @staticmethod
     def restore_single_from_log(directory: str, log_entry: Dict) -> bool:
         """
@@ -5,6 +5,7 @@
 负责文件重命名的核心逻辑
 """
 
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
@@ -12,6 +13,16 @@ from libs.core.rule import RegexRule
 from libs.core.file_manager import FileManager
 
 
+@dataclass(slots=True)
+class RenameResult:
+    """单个文件的重命名执行结果"""
+    original_name: str
+    new_name: str
+    status: str
+    reason: str
+    match_info: str = "无"
+
+
 class MediaRenamer:
     """媒体文件重命名器"""
     
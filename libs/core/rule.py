@@ -5,15 +5,113 @@
 包含正则表达式规则类和规则文件管理器
 """
 
+import os
 import re
 import json
 import glob
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 
 from libs.config import DEFAULT_RULES_DIR, DEFAULT_RULES, ENABLE_PARENT_FOLDER_RECOGNITION, PARENT_FOLDER_RECOGNITION_CONFIG
 from libs.core.config_manager import ConfigManager
 
+# 可选依赖：第三方 regex 引擎对大交替模式更快、回溯行为更可控，
+# 未安装时回退到标准库 re
+try:
+    import regex as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str):
+    """按模式字符串缓存编译结果，规则重载时相同模式不再重新解析"""
+    return _regex_engine.compile(pattern)
+
+
+def _longest_required_literal(pattern: str) -> str:
+    """
+    从正则模式中提取最长的必然出现的字面子串
+
+    用于匹配前的快速排除：文件名不包含该子串时无需运行正则引擎。
+    提取策略保守，遇到无法确定的结构（字符类、转义、交替、可选量词）
+    即截断当前字面段，宁可返回空串也不错误排除。
+    """
+    metachars = set('\\[](){}|?*+.^$')
+    quantifiers = set('?*{')
+    runs = []
+    current = []
+    depth = 0
+    i = 0
+    n = len(pattern)
+
+    def _flush():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    while i < n:
+        c = pattern[i]
+        if c == '\\':
+            # 转义序列可能是字符类（\d）也可能是字面量，保守截断
+            _flush()
+            i += 2
+        elif c == '(':
+            depth += 1
+            _flush()
+            i += 1
+        elif c == ')':
+            depth -= 1
+            _flush()
+            i += 1
+        elif c == '[':
+            # 跳过整个字符类
+            _flush()
+            i += 1
+            if i < n and pattern[i] == '^':
+                i += 1
+            if i < n and pattern[i] == ']':
+                i += 1
+            while i < n and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+            i += 1
+        elif c == '{':
+            # 跳过量词/重复次数的大括号内容
+            _flush()
+            while i < n and pattern[i] != '}':
+                i += 1
+            i += 1
+        elif c == '|':
+            # 顶层交替：任一分支都可能匹配，没有必然字面量
+            if depth == 0:
+                return ""
+            _flush()
+            i += 1
+        elif c in metachars:
+            _flush()
+            i += 1
+        elif depth > 0:
+            # 分组内部可能被交替/量词作用，不视为必然出现
+            i += 1
+        elif i + 1 < n and pattern[i + 1] in quantifiers:
+            # 后面跟可选量词的字面字符不是必然出现的
+            _flush()
+            i += 1
+        else:
+            current.append(c)
+            i += 1
+
+    _flush()
+    longest = max(runs, key=len, default="")
+    # 太短的字面量过滤价值低于子串查找成本
+    return longest if len(longest) >= 3 else ""
+
+
+# generate_output 中反复使用的模式，模块级预编译避免每个文件重新查找
+_SEASON_SUB_RX = re.compile(r'S\d+')
+_SPECIAL_EPISODE_RX = re.compile(r'S(\d+)E[^-\s]*')
+_TECH_INFO_SPACE_RX = re.compile(r'(S\d+E\d+)(\[)')
+
 
 class RegexRule:
     """正则表达式规则类"""
@@ -35,22 +133,37 @@ class RegexRule:
         self.output_format = output_format
         self.special_handling = special_handling or {}
         self.config_manager = config_manager or ConfigManager()
-        self.compiled_pattern = re.compile(pattern)
-    
+        # 构造即编译：规则加载/重载时就付出编译成本，首次预览不再有编译延迟，
+        # 非法模式也在加载阶段按规则单独报错（见 RuleFileManager.load_all_rules）
+        self.compiled_pattern = _compile_pattern(pattern)
+        # 匹配前快速排除用的必然字面子串（可能为空串，表示无法提取）
+        self.required_literal = _longest_required_literal(pattern)
+        # 匹配结果缓存：同一文件名在预览和执行阶段会被匹配多次
+        self._match_cache: Dict[str, Optional[Dict[str, str]]] = {}
+
     def match(self, filename: str) -> Optional[Dict[str, str]]:
         """匹配文件名并返回提取的信息"""
+        cached = self._match_cache.get(filename, False)
+        if cached is not False:
+            # 调用方会就地修改结果（如替换series），返回副本保护缓存
+            return dict(cached) if cached is not None else None
+
         match = self.compiled_pattern.search(filename)
         if not match:
-            return None
-        
-        result = {}
-        for group_name, group_index in self.groups.items():
-            if group_index <= len(match.groups()):
-                result[group_name] = match.group(group_index)
-            else:
-                result[group_name] = ""
-        
-        return result
+            result = None
+        else:
+            result = {}
+            for group_name, group_index in self.groups.items():
+                if group_index <= len(match.groups()):
+                    result[group_name] = match.group(group_index)
+                else:
+                    result[group_name] = ""
+
+        # 简单容量上限，防止跨多次扫描无限增长
+        if len(self._match_cache) >= 4096:
+            self._match_cache.clear()
+        self._match_cache[filename] = result
+        return dict(result) if result is not None else None
     
     def get_folder_recognition_info(self, file_path: str) -> Dict[str, str]:
         """
@@ -158,12 +271,10 @@ class RegexRule:
                 parent_info = self.extract_parent_info(file_path)
             
             # 处理空标题的情况
-            processed_info = {}
-            for key, value in extracted_info.items():
-                if value is None or value.strip() == "":
-                    processed_info[key] = ""
-                else:
-                    processed_info[key] = value
+            processed_info = {
+                key: "" if value is None or value.strip() == "" else value
+                for key, value in extracted_info.items()
+            }
             
             # 特殊处理：大写字段
             if self.special_handling and 'uppercase_fields' in self.special_handling:
@@ -232,7 +343,6 @@ class RegexRule:
                     
                     # 检查是否是年份
                     if 'year_pattern' in self.special_handling:
-                        import re
                         year_pattern = self.special_handling['year_pattern']
                         if re.search(year_pattern, episode_num):
                             # 这是年份，不是集数
@@ -249,11 +359,10 @@ class RegexRule:
                             if not processed_info.get('title'):
                                 processed_info['title'] = f"({episode_num})"
             
-            # 生成基础格式
-            base_output = self.output_format.format(**processed_info)
+            # 生成基础格式（format_map 直接使用现有字典，省去 **kwargs 复制）
+            base_output = self.output_format.format_map(processed_info)
             
             # 处理季数信息（优先级：自定义季数 > 父文件夹季数 > 默认季数）
-            import re
             episode_value = processed_info.get('episode', '')
             
             # 确定使用的季数
@@ -271,7 +380,7 @@ class RegexRule:
             
             # 如果确定了季数，替换输出中的季数部分
             if season_num:
-                base_output = re.sub(r'S\d+', f'S{season_num}', base_output)
+                base_output = _SEASON_SUB_RX.sub(f'S{season_num}', base_output)
             
             # 特殊处理：特殊集数的显示格式
             if 'episode' in processed_info:
@@ -281,7 +390,7 @@ class RegexRule:
                 if episode_upper in ['OVA', 'SP', 'SPECIAL']:
                     # OVA/SP显示为S{season} {episode_value}格式
                     # 例如：S02EOVA -> S02 OVA
-                    base_output = re.sub(r'S(\d+)E[^-\s]*', rf'S\1 {episode_value}', base_output)
+                    base_output = _SPECIAL_EPISODE_RX.sub(rf'S\1 {episode_value}', base_output)
                 elif 'END' in episode_upper:
                     # END保持原样，如S01E13 END
                     pass  # 不需要特殊处理，保持原样
@@ -295,8 +404,7 @@ class RegexRule:
                 base_output = base_output[:-3]
             
             # 特殊处理：如果技术信息前面没有空格，添加空格
-            import re
-            base_output = re.sub(r'(S\d+E\d+)(\[)', r'\1 \2', base_output)
+            base_output = _TECH_INFO_SPACE_RX.sub(r'\1 \2', base_output)
             
             # 特殊处理：CASO完整格式需要添加后缀
             if self.name == 'CASO完整格式' and 'suffix' in processed_info:
@@ -338,9 +446,29 @@ class RuleFileManager:
     def __init__(self, rules_dir=DEFAULT_RULES_DIR):
         self.rules_dir = Path(rules_dir)
         self.rules_dir.mkdir(exist_ok=True)
-    
+        # 规则缓存：目录内容指纹未变时 load_all_rules 直接复用
+        self._cache_key = None
+        self._cached_rules: List[RegexRule] = []
+
+    def _rules_dir_state(self):
+        """规则目录的内容指纹：所有json文件的路径和修改时间"""
+        try:
+            with os.scandir(self.rules_dir) as entries:
+                return tuple(sorted(
+                    (entry.path, entry.stat().st_mtime_ns)
+                    for entry in entries
+                    if entry.is_file() and entry.name.endswith('.json')
+                ))
+        except OSError:
+            return None
+
     def load_all_rules(self) -> List[RegexRule]:
         """加载所有规则文件"""
+        # 目录内容未变时跳过磁盘读取和JSON解析
+        state = self._rules_dir_state()
+        if state is not None and state == self._cache_key:
+            return list(self._cached_rules)
+
         rules = []
         rule_files = glob.glob(str(self.rules_dir / "*.json"))
         
@@ -352,8 +480,10 @@ class RuleFileManager:
                     rules.append(rule)
             except Exception as e:
                 print(f"加载规则文件失败 {rule_file}: {e}")
-        
-        return rules
+
+        self._cache_key = state
+        self._cached_rules = rules
+        return list(rules)
     
     def save_rule(self, rule: RegexRule) -> bool:
         """保存规则到文件"""
@@ -361,6 +491,7 @@ class RuleFileManager:
             rule_file = self.rules_dir / f"{rule.name}.json"
             with open(rule_file, 'w', encoding='utf-8') as f:
                 json.dump(rule.to_dict(), f, ensure_ascii=False, indent=2)
+            self._cache_key = None
             return True
         except Exception as e:
             print(f"保存规则失败: {e}")
@@ -372,6 +503,7 @@ class RuleFileManager:
             rule_file = self.rules_dir / f"{rule_name}.json"
             if rule_file.exists():
                 rule_file.unlink()
+                self._cache_key = None
                 return True
             return False
         except Exception as e:
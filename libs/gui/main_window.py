@@ -108,8 +108,8 @@ class MainWindow:
     
     def setup_hot_reload(self):
         """设置热重载"""
-        # 创建不跳转的热重载回调
-        def reload_callback():
+        # 创建不跳转的热重载回调（批量事件传入变更路径，这里整体重载）
+        def reload_callback(paths=None):
             self.reload_code(auto_switch_tab=False)
         
         self.hot_reload_manager.set_reload_callback(reload_callback)
@@ -169,7 +169,11 @@ class MainWindow:
                     tab_ids = list(self.notebook.tabs())
                     for tab_id in tab_ids:
                         try:
+                            # forget只是摘除，还要destroy让<Destroy>清理
+                            # （日志观察者注销等）得以执行，避免跨重载累积
+                            tab_widget = self.notebook.nametowidget(tab_id)
                             self.notebook.forget(tab_id)
+                            tab_widget.destroy()
                         except:
                             pass
                 except:
@@ -224,5 +228,5 @@ class MainWindow:
             self.root.mainloop()
         finally:
             # 程序退出时清理资源
-            self.hot_reload_manager.stop_file_monitoring()
             self.hot_reload_manager.add_reload_log("程序已退出", "INFO")
+            self.hot_reload_manager.shutdown()
@@ -7,15 +7,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import List, Dict, Callable, Optional
+from collections import OrderedDict
 from libs.config import TREEVIEW_COLUMN_WIDTH
 
+# 虚拟化参数：超过阈值的行先排队，滚动接近底部时按块物化
+VIRTUAL_THRESHOLD = 1000
+VIRTUAL_CHUNK = 500
+
 
 class PreviewDisplay:
     """预览显示组件"""
-    
+
     def __init__(self, parent_frame: ttk.Frame, main_window=None):
         self.parent_frame = parent_frame
         self.main_window = main_window
+        # 增量刷新用：原文件名 -> 树节点iid / 上次渲染的行内容
+        self._row_ids: Dict[str, str] = {}
+        self._last_values: Dict[str, tuple] = {}
+        # 超大列表时等待物化的行：原文件名 -> (values, tags)
+        self._overflow_rows: "OrderedDict[str, tuple]" = OrderedDict()
+        # 批量插入期间树被暂时摘出布局
+        self._in_bulk = False
         self.create_widgets()
     
     def create_widgets(self):
@@ -40,24 +52,59 @@ class PreviewDisplay:
         for col in columns:
             self.preview_tree.heading(col, text=col)
             self.preview_tree.column(col, width=TREEVIEW_COLUMN_WIDTH)
+
+        # 缓存列标题，复制操作不再逐列调用 heading()
+        self._column_titles = columns
+
+        # 重复文件名的高亮样式只需配置一次
+        self.preview_tree.tag_configure('duplicate', foreground='red')
         
-        # 添加滚动条
-        scrollbar = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
-        self.preview_tree.configure(yscrollcommand=scrollbar.set)
-        
+        # 添加滚动条（经过 _on_scroll 钩子以便滚动到底部时物化后续行）
+        self.scrollbar = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
+        self.preview_tree.configure(yscrollcommand=self._on_scroll)
+
         self.preview_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def _on_scroll(self, first, last):
+        """滚动回调：接近底部时物化下一批排队的行"""
+        self.scrollbar.set(first, last)
+        if self._overflow_rows and float(last) > 0.9:
+            self._materialize_chunk()
+
+    def _materialize_chunk(self):
+        """把下一批排队的行插入树中"""
+        for _ in range(min(VIRTUAL_CHUNK, len(self._overflow_rows))):
+            name, (values, tags) = self._overflow_rows.popitem(last=False)
+            iid = self.preview_tree.insert('', tk.END, values=values, tags=tags)
+            self._row_ids[name] = iid
+            self._last_values[name] = (values, tags)
     
+    def begin_bulk(self):
+        """批量插入前把树从布局中摘除，冻结逐行重绘"""
+        self._in_bulk = True
+        self.preview_tree.pack_forget()
+
+    def end_bulk(self):
+        """批量插入结束后重新挂载，只触发一次整体重绘"""
+        if not self._in_bulk:
+            return
+        self._in_bulk = False
+        self.preview_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, before=self.scrollbar)
+
     def clear_preview(self):
         """清空预览"""
         for item in self.preview_tree.get_children():
             self.preview_tree.delete(item)
-    
-    def add_preview_item(self, original_name: str, new_name: str, status: str, 
-                        applied_rule: str, match_info: str, match_score: str, 
-                        rename_status: str = "未执行", is_duplicate: bool = False, 
+        self._row_ids.clear()
+        self._last_values.clear()
+        self._overflow_rows.clear()
+
+    def add_preview_item(self, original_name: str, new_name: str, status: str,
+                        applied_rule: str, match_info: str, match_score: str,
+                        rename_status: str = "未执行", is_duplicate: bool = False,
                         folder_info: Dict = None):
-        """添加预览项"""
+        """添加或更新预览项（按原文件名增量刷新，内容未变化的行不动）"""
         # 构建文件夹识别信息显示
         folder_info_text = ""
         if folder_info:
@@ -68,45 +115,73 @@ class PreviewDisplay:
                 info_parts.append(f"季数: S{folder_info['season']}")
             if info_parts:
                 folder_info_text = " | ".join(info_parts)
-        
+
         # 在匹配信息中添加文件夹识别信息
         if folder_info_text:
             if match_info and match_info != "请先应用规则":
                 match_info = f"{match_info} | 文件夹识别: {folder_info_text}"
             else:
                 match_info = f"文件夹识别: {folder_info_text}"
-        
-        item = self.preview_tree.insert('', tk.END, values=(
-            original_name, new_name, status, applied_rule, match_info, match_score, rename_status
-        ))
-        
-        # 如果是重复文件名，设置红色标签
-        if is_duplicate:
-            self.preview_tree.set(item, '新文件名', new_name + " ⚠️")
-            self.preview_tree.item(item, tags=('duplicate',))
-        
+
+        display_name = new_name + " ⚠️" if is_duplicate else new_name
+        values = (original_name, display_name, status, applied_rule, match_info, match_score, rename_status)
+        tags = ('duplicate',) if is_duplicate else ()
+
+        item = self._row_ids.get(original_name)
+        if item is not None and self.preview_tree.exists(item):
+            if self._last_values.get(original_name) != (values, tags):
+                self.preview_tree.item(item, values=values, tags=tags)
+            self._last_values[original_name] = (values, tags)
+            return item
+
+        # 新行：超过物化阈值时先排队，滚动到底部时再插入
+        if len(self._row_ids) >= VIRTUAL_THRESHOLD:
+            self._overflow_rows[original_name] = (values, tags)
+            return None
+
+        item = self.preview_tree.insert('', tk.END, values=values, tags=tags)
+        self._row_ids[original_name] = item
+        self._last_values[original_name] = (values, tags)
         return item
+
+    def prune_preview_items(self, keep_names):
+        """删除不在当前文件集合中的预览行"""
+        keep = set(keep_names)
+        for name in list(self._row_ids):
+            if name not in keep:
+                iid = self._row_ids.pop(name)
+                self._last_values.pop(name, None)
+                if self.preview_tree.exists(iid):
+                    self.preview_tree.delete(iid)
+        for name in list(self._overflow_rows):
+            if name not in keep:
+                del self._overflow_rows[name]
     
-    def update_rename_status(self, detailed_results: List[Dict]):
-        """更新预览树中的重命名状态"""
+    def update_rename_status(self, detailed_results: List):
+        """更新预览树中的重命名状态（按iid定位，只写状态列）"""
         if not detailed_results:
             return
-            
-        # 创建文件名到结果的映射
-        result_map = {}
+
+        # detailed_results 由执行逻辑产出，结构可信
         for result in detailed_results:
-            if isinstance(result, dict) and 'original_name' in result:
-                result_map[result['original_name']] = result
-        
-        # 更新预览树中的状态
-        for item in self.preview_tree.get_children():
-            values = list(self.preview_tree.item(item, 'values'))
-            if len(values) >= 7:  # 确保有足够的列
-                original_name = values[0]
-                if original_name in result_map:
-                    result = result_map[original_name]
-                    values[6] = result.get('status', '未知')  # 更新重命名状态列
-                    self.preview_tree.item(item, values=values)
+            original_name = result.original_name
+            if not original_name:
+                continue
+            status = result.status
+            # 尚未物化的行只更新排队数据
+            if original_name in self._overflow_rows:
+                values, tags = self._overflow_rows[original_name]
+                self._overflow_rows[original_name] = (values[:6] + (status,), tags)
+                continue
+            iid = self._row_ids.get(original_name)
+            if iid is None or not self.preview_tree.exists(iid):
+                continue
+            self.preview_tree.set(iid, '重命名状态', status)
+            # 同步增量刷新缓存，避免下一次预览用旧状态比较
+            cached = self._last_values.get(original_name)
+            if cached:
+                values, tags = cached
+                self._last_values[original_name] = (values[:6] + (status,), tags)
     
     def copy_selected_preview(self):
         """复制选中的预览行"""
@@ -115,99 +190,78 @@ class PreviewDisplay:
             messagebox.showwarning("警告", "请先选择要复制的行")
             return
         
-        # 获取列标题
-        columns = [self.preview_tree.heading(col)['text'] for col in self.preview_tree['columns']]
-        
-        # 构建复制内容
-        copy_content = []
-        for item_id in selection:
-            item = self.preview_tree.item(item_id)
-            values = item['values']
-            # 将列标题和值组合成键值对
-            row_data = []
-            for i, value in enumerate(values):
-                if i < len(columns):
-                    row_data.append(f"{columns[i]}: {value}")
-            copy_content.append(" | ".join(row_data))
+        # 获取列标题（创建时缓存）
+        columns = self._column_titles
         
+        # 构建复制内容（选中行通常很少，逐行读取即可）
+        copy_content = [
+            " | ".join(
+                f"{col}: {value}"
+                for col, value in zip(columns, self.preview_tree.item(item_id, 'values'))
+            )
+            for item_id in selection
+        ]
+
         # 复制到剪贴板
         copy_text = "\n".join(copy_content)
         self._copy_to_clipboard(copy_text)
         messagebox.showinfo("成功", f"已复制 {len(selection)} 行到剪贴板")
     
+    def _iter_row_values(self):
+        """按显示顺序迭代所有行的值（含未物化的行），不经过Tcl往返"""
+        for name in self._row_ids:
+            yield self._last_values[name][0]
+        for values, _tags in self._overflow_rows.values():
+            yield values
+
     def copy_all_preview(self):
         """复制所有预览行（不含表头）"""
-        items = self.preview_tree.get_children()
-        if not items:
+        rows = list(self._iter_row_values())
+        if not rows:
             messagebox.showwarning("警告", "没有数据可复制")
             return
-        
-        # 获取列标题
-        columns = [self.preview_tree.heading(col)['text'] for col in self.preview_tree['columns']]
-        
-        # 构建复制内容
-        copy_content = []
-        for item_id in items:
-            item = self.preview_tree.item(item_id)
-            values = item['values']
-            # 将列标题和值组合成键值对
-            row_data = []
-            for i, value in enumerate(values):
-                if i < len(columns):
-                    row_data.append(f"{columns[i]}: {value}")
-            copy_content.append(" | ".join(row_data))
-        
-        # 复制到剪贴板
-        copy_text = "\n".join(copy_content)
+
+        # 获取列标题（创建时缓存）
+        columns = self._column_titles
+
+        # 从内存镜像构建复制内容
+        copy_text = "\n".join(
+            " | ".join(f"{col}: {value}" for col, value in zip(columns, row))
+            for row in rows
+        )
         self._copy_to_clipboard(copy_text)
-        messagebox.showinfo("成功", f"已复制 {len(items)} 行到剪贴板")
+        messagebox.showinfo("成功", f"已复制 {len(rows)} 行到剪贴板")
     
     def copy_all_preview_with_header(self):
         """复制所有预览行（含表头）"""
-        items = self.preview_tree.get_children()
-        if not items:
+        rows = list(self._iter_row_values())
+        if not rows:
             messagebox.showwarning("警告", "没有数据可复制")
             return
-        
-        # 获取列标题
-        columns = [self.preview_tree.heading(col)['text'] for col in self.preview_tree['columns']]
-        
-        # 构建复制内容
-        copy_content = []
-        
-        # 添加表头
-        header_row = " | ".join(columns)
-        copy_content.append(header_row)
-        
-        # 添加分隔线
-        separator = " | ".join(["-" * len(col) for col in columns])
-        copy_content.append(separator)
-        
-        # 添加数据行
-        for item_id in items:
-            item = self.preview_tree.item(item_id)
-            values = item['values']
-            # 直接使用值，不添加列标题
-            row_data = []
-            for i, value in enumerate(values):
-                if i < len(columns):
-                    row_data.append(str(value))
-            copy_content.append(" | ".join(row_data))
-        
-        # 复制到剪贴板
-        copy_text = "\n".join(copy_content)
-        self._copy_to_clipboard(copy_text)
-        messagebox.showinfo("成功", f"已复制 {len(items)} 行（含表头）到剪贴板")
+
+        # 获取列标题（创建时缓存）
+        columns = self._column_titles
+
+        # 表头 + 分隔线 + 数据行
+        copy_content = [
+            " | ".join(columns),
+            " | ".join("-" * len(col) for col in columns),
+        ]
+        copy_content.extend(
+            " | ".join(str(value) for value in row) for row in rows
+        )
+        self._copy_to_clipboard("\n".join(copy_content))
+        messagebox.showinfo("成功", f"已复制 {len(rows)} 行（含表头）到剪贴板")
     
     def _copy_to_clipboard(self, text: str):
         """复制文本到剪贴板"""
         if self.main_window and hasattr(self.main_window, 'root'):
-            self.main_window.root.clipboard_clear()
-            self.main_window.root.clipboard_append(text)
-            self.main_window.root.update()  # 确保剪贴板更新
+            window = self.main_window.root
         else:
             # 备用方案：使用父窗口
-            parent = self.parent_frame.winfo_toplevel()
-            parent.clipboard_clear()
-            parent.clipboard_append(text)
-            parent.update()
+            window = self.parent_frame.winfo_toplevel()
+        window.clipboard_clear()
+        window.clipboard_append(text)
+        # update_idletasks 只刷新空闲任务即可让Tk接管剪贴板，
+        # 不像 update() 那样强制跑完整个事件循环（会连带重绘大列表）
+        window.update_idletasks()
@@ -4,15 +4,18 @@
 状态栏组件
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk
 
 
 class StatusBar:
     """状态栏组件"""
-    
+
     def __init__(self, parent_frame: ttk.Frame):
         self.parent_frame = parent_frame
+        # 强制重绘节流（约30Hz），避免逐文件刷新拖慢批量操作
+        self._last_redraw = 0.0
         self.create_widgets()
     
     def create_widgets(self):
@@ -48,9 +51,12 @@ class StatusBar:
         
         if filename and status:
             self.status_var.set(f"正在处理: {filename} - {status}")
-        
-        # 强制更新界面
-        self.parent_frame.update_idletasks()
+
+        # 强制更新界面（限制在约30Hz，最后一个文件必定刷新）
+        now = time.monotonic()
+        if now - self._last_redraw >= 0.033 or current == total:
+            self.parent_frame.update_idletasks()
+            self._last_redraw = now
     
     def reset_progress(self):
         """重置进度条"""
@@ -8,6 +8,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, List, Optional, Dict
 from pathlib import Path
+from collections import OrderedDict
 import re
 
 from libs.core.rule import RegexRule
@@ -33,8 +34,29 @@ class TitleEditor:
         # 文件夹识别相关
         self.current_folder_info = {}
         self.current_file_paths = []
-        
+
+        # 自定义剧集名缓存，避免每次读取都走 Tk 桥接再 strip
+        self._custom_title_cache = ""
+
+        # 文件夹识别结果缓存（LRU，避免重复点击同一文件夹时重复分析）
+        self._folder_cache: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+        self._folder_cache_maxsize = 256
+
+        # 预编译季数识别模式
+        self._refresh_season_patterns()
+
         self.create_widgets()
+
+    def _refresh_season_patterns(self):
+        """刷新季数识别模式，合并为单个正则以减少匹配次数"""
+        self._season_patterns = self.config_manager.get_season_patterns()
+        # 合并所有模式为一个交替正则，每个路径部分只需匹配一次
+        self._combined_season_rx = re.compile(
+            "|".join(f"(?:{p})" for p in self._season_patterns),
+            re.IGNORECASE
+        )
+        # 配置变化后旧的识别结果不再可信
+        self._folder_cache.clear()
     
     def create_widgets(self):
         """创建界面组件"""
@@ -46,13 +68,26 @@ class TitleEditor:
         ttk.Label(title_frame, text="注意：即使规则没有匹配到series字段，也可以设置自定义剧集名").pack(anchor=tk.W, padx=5, pady=2)
         
         # 统一的设置区域（文件夹识别 + 自定义设置）
-        settings_frame = ttk.LabelFrame(title_frame, text="剧集设置")
-        settings_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # 第一行：文件夹识别信息（三列布局）
-        folder_row = ttk.Frame(settings_frame)
-        folder_row.pack(fill=tk.X, padx=5, pady=5)
-        
+        self.settings_frame = ttk.LabelFrame(title_frame, text="剧集设置")
+        self.settings_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        # 文件夹识别组件延迟创建，仅在识别功能启用时构建
+        self._folder_widgets_built = False
+
+        # 自定义设置部分始终创建
+        self._create_custom_widgets(self.settings_frame)
+
+        # 状态显示（跨三列）
+        self.folder_status_var = tk.StringVar()
+        self.folder_status_label = ttk.Label(self.settings_frame, textvariable=self.folder_status_var, foreground="gray")
+        self.folder_status_label.pack(anchor=tk.W, padx=5, pady=2)
+
+    def _create_folder_widgets(self):
+        """创建文件夹识别组件（延迟构建，仅在识别功能启用时调用）"""
+        # 第一行：文件夹识别信息（三列布局），插入到自定义设置之前保持布局顺序
+        folder_row = ttk.Frame(self.settings_frame)
+        folder_row.pack(fill=tk.X, padx=5, pady=5, before=self.custom_row)
+
         # 列1：识别到的剧名
         folder_series_col = ttk.Frame(folder_row)
         folder_series_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
@@ -104,11 +139,19 @@ class TitleEditor:
         self.apply_folder_all_button.pack(side=tk.LEFT, padx=(0, 2))
         
         ttk.Button(folder_btn_frame, text="清除", command=self._clear_folder_info).pack(side=tk.LEFT)
-        
+
+        # 组件被销毁时（如热重载）重置标记，允许重新构建
+        folder_row.bind('<Destroy>', lambda e: setattr(self, '_folder_widgets_built', False))
+
+        self._folder_widgets_built = True
+
+    def _create_custom_widgets(self, settings_frame):
+        """创建自定义设置组件"""
         # 第二行：自定义设置（三列布局）
         custom_row = ttk.Frame(settings_frame)
         custom_row.pack(fill=tk.X, padx=5, pady=5)
-        
+        self.custom_row = custom_row
+
         # 列1：自定义剧集名
         custom_title_col = ttk.Frame(custom_row)
         custom_title_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
@@ -140,15 +183,11 @@ class TitleEditor:
         ttk.Button(custom_btn_frame, text="应用剧集名", command=self._apply_custom_title).pack(side=tk.LEFT, padx=(0, 2))
         ttk.Button(custom_btn_frame, text="应用季数", command=self._apply_custom_season).pack(side=tk.LEFT, padx=(0, 2))
         ttk.Button(custom_btn_frame, text="清除", command=self._clear_custom_settings).pack(side=tk.LEFT)
-        
-        # 状态显示（跨三列）
-        self.folder_status_var = tk.StringVar()
-        self.folder_status_label = ttk.Label(settings_frame, textvariable=self.folder_status_var, foreground="gray")
-        self.folder_status_label.pack(anchor=tk.W, padx=5, pady=2)
-    
+
     def _on_title_change(self, event=None):
         """剧集名变化事件"""
         custom_title = self.custom_title_var.get().strip()
+        self._custom_title_cache = custom_title
         self.on_title_change(custom_title)
     
     def _on_season_change(self, event=None):
@@ -159,7 +198,7 @@ class TitleEditor:
     
     def _apply_custom_title(self):
         """应用自定义剧集名到所有文件"""
-        custom_title = self.custom_title_var.get().strip()
+        custom_title = self._custom_title_cache
         if not custom_title:
             messagebox.showwarning("警告", "请输入自定义剧集名")
             return
@@ -187,21 +226,24 @@ class TitleEditor:
     def _clear_custom_settings(self):
         """清除自定义设置"""
         self.custom_title_var.set("")
+        self._custom_title_cache = ""
         self.custom_season_var.set("")
         self.on_clear_custom_title()
     
     def _clear_custom_title(self):
         """清除自定义剧集名"""
         self.custom_title_var.set("")
+        self._custom_title_cache = ""
         self.on_clear_custom_title()
     
     def get_custom_title(self) -> str:
         """获取自定义剧集名"""
-        return self.custom_title_var.get().strip()
+        return self._custom_title_cache
     
     def set_custom_title(self, title: str):
         """设置自定义剧集名"""
         self.custom_title_var.set(title)
+        self._custom_title_cache = title.strip()
     
     def get_custom_season(self) -> str:
         """获取自定义季数"""
@@ -231,17 +273,30 @@ class TitleEditor:
             self.folder_status_var.set("文件夹识别功能已禁用")
             self._update_folder_button_states(False, False)
             return
-        
+
+        # 首次启用识别时才构建文件夹识别组件
+        if not self._folder_widgets_built:
+            self._create_folder_widgets()
+
         # 使用第一个文件路径进行分析
         first_file_path = str(file_paths[0])
-        
-        if applied_rule:
-            # 使用规则进行识别
-            folder_info = applied_rule.get_folder_recognition_info(first_file_path)
+
+        # 命中缓存时直接复用之前的分析结果
+        cache_key = (first_file_path, applied_rule.name if applied_rule else None)
+        if cache_key in self._folder_cache:
+            self._folder_cache.move_to_end(cache_key)
+            folder_info = self._folder_cache[cache_key]
         else:
-            # 直接分析路径
-            folder_info = self._analyze_path_directly(first_file_path)
-        
+            if applied_rule:
+                # 使用规则进行识别
+                folder_info = applied_rule.get_folder_recognition_info(first_file_path)
+            else:
+                # 直接分析路径
+                folder_info = self._analyze_path_directly(first_file_path)
+            self._folder_cache[cache_key] = folder_info
+            if len(self._folder_cache) > self._folder_cache_maxsize:
+                self._folder_cache.popitem(last=False)
+
         self.current_folder_info = folder_info
         
         # 更新显示
@@ -263,33 +318,30 @@ class TitleEditor:
             return folder_info
             
         path_parts = Path(file_path).parts
-        
-        # 使用配置中的季数识别模式
-        season_patterns = self.config_manager.get_season_patterns()
-        
-        # 查找季数信息
-        for part in reversed(path_parts):  # 从后往前查找
-            for pattern in season_patterns:
-                match = re.search(pattern, part, re.IGNORECASE)
-                if match:
-                    folder_info['season'] = match.group(1).zfill(2)  # 补零，如01, 02
+
+        # 使用预编译的合并季数模式，每个路径部分只匹配一次
+        season_rx = self._combined_season_rx
+
+        # 查找季数信息（按索引从后往前，避免 reversed 迭代器开销）
+        for idx in range(len(path_parts) - 1, -1, -1):
+            match = season_rx.search(path_parts[idx])
+            if match:
+                # 从匹配结果中提取数字部分作为季数
+                num_match = re.search(r'\d+', match.group())
+                if num_match:
+                    folder_info['season'] = num_match.group().zfill(2)  # 补零，如01, 02
                     break
-            if 'season' in folder_info:
-                break
-        
+
         # 查找剧名
         if 'season' in folder_info:
             for i, part in enumerate(path_parts):
                 # 查找包含季数信息的文件夹
-                for pattern in season_patterns:
-                    if re.search(pattern, part, re.IGNORECASE):
-                        # 找到季数文件夹，其父文件夹通常是剧名
-                        if i > 0:
-                            folder_info['series'] = path_parts[i-1]
+                if season_rx.search(part):
+                    # 找到季数文件夹，其父文件夹通常是剧名
+                    if i > 0:
+                        folder_info['series'] = path_parts[i-1]
                         break
-                if 'series' in folder_info:
-                    break
-        
+
         return folder_info
     
     def _update_folder_display(self, folder_info: Dict[str, str]):
@@ -325,6 +377,8 @@ class TitleEditor:
     
     def _update_folder_button_states(self, has_series: bool, has_season: bool):
         """更新文件夹识别按钮状态"""
+        if not self._folder_widgets_built:
+            return
         self.apply_folder_series_button.config(state="normal" if has_series else "disabled")
         self.apply_folder_season_button.config(state="normal" if has_season else "disabled")
         self.apply_folder_all_button.config(state="normal" if (has_series or has_season) else "disabled")
@@ -339,6 +393,7 @@ class TitleEditor:
         
         # 设置到自定义剧集名输入框
         self.custom_title_var.set(series_name)
+        self._custom_title_cache = series_name
         # 调用应用回调
         self.on_apply_custom_title(series_name)
         
@@ -372,6 +427,7 @@ class TitleEditor:
         # 应用剧名（如果有）
         if series:
             self.custom_title_var.set(series)
+            self._custom_title_cache = series
             self.on_apply_custom_title(series)
         
         # 应用季数（如果有）
@@ -386,8 +442,9 @@ class TitleEditor:
         """清除文件夹识别信息"""
         self.current_folder_info = {}
         self.current_file_paths = []
-        self.folder_series_var.set("")
-        self.folder_season_var.set("")
+        if self._folder_widgets_built:
+            self.folder_series_var.set("")
+            self.folder_season_var.set("")
         self.folder_status_var.set("")
         self._update_folder_button_states(False, False)
     
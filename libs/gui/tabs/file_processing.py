@@ -5,23 +5,17 @@
 负责文件选择、规则选择、预览和执行重命名
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
 from typing import List, Optional
 
 from libs.core.rule import RegexRule, RuleFileManager
-from libs.gui.tabs.components.directory_selector import DirectorySelector
-from libs.gui.tabs.components.rule_selector import RuleSelector
-from libs.gui.tabs.components.rule_detail_display import RuleDetailDisplay
-from libs.gui.tabs.components.title_editor import TitleEditor
-from libs.gui.tabs.components.preview_display import PreviewDisplay
-from libs.gui.tabs.components.action_buttons import ActionButtons
-from libs.gui.tabs.components.status_bar import StatusBar
-from libs.gui.tabs.components.config_button import ConfigButton
 from libs.core.config_manager import ConfigManager
-from libs.gui.tabs.logic.file_processing_logic import FileProcessingLogic
-from libs.gui.tabs.logic.result_handler import ResultHandler
+
+# 组件与业务逻辑模块在构造时才导入，缩短冷启动和热重载的导入链
 
 
 class FileProcessingTab:
@@ -31,20 +25,48 @@ class FileProcessingTab:
         self.parent_notebook = parent_notebook
         self.main_window = main_window
         
+        from libs.gui.tabs.logic.file_processing_logic import FileProcessingLogic
+        from libs.gui.tabs.logic.result_handler import ResultHandler
+
         # 配置管理器
         self.config_manager = ConfigManager()
-        
+
         # 业务逻辑
         self.logic = FileProcessingLogic(rule_manager, rules)
-        
+
         # 结果处理
         self.result_handler = ResultHandler(None)  # 将在create_widgets中设置
-        
+
+        # 预览防抖：合并短时间内的多次预览请求
+        self._preview_after_id = None
+
+        # 标签页不可见时跳过预览，切回时按脏标记补算
+        self._preview_dirty = False
+
+        # 重命名执行期间暂停预览，避免与工作线程竞争文件状态
+        self._rename_in_progress = False
+
+        # 扫描在daemon工作线程上执行（挂死的网络扫描不会阻塞退出），
+        # 同一时间只允许一个扫描在途，避免并发改写logic状态
+        self._scan_thread: Optional[threading.Thread] = None
+
+        # 文件夹识别去重：输入状态未变时跳过重新分析
+        self._last_folder_recog_key = None
+
         # 创建界面
         self.create_widgets()
     
     def create_widgets(self):
         """创建界面组件"""
+        from libs.gui.tabs.components.directory_selector import DirectorySelector
+        from libs.gui.tabs.components.rule_selector import RuleSelector
+        from libs.gui.tabs.components.rule_detail_display import RuleDetailDisplay
+        from libs.gui.tabs.components.title_editor import TitleEditor
+        from libs.gui.tabs.components.preview_display import PreviewDisplay
+        from libs.gui.tabs.components.action_buttons import ActionButtons
+        from libs.gui.tabs.components.status_bar import StatusBar
+        from libs.gui.tabs.components.config_button import ConfigButton
+
         # 主框架
         self.frame = ttk.Frame(self.parent_notebook)
         self.parent_notebook.add(self.frame, text="文件处理")
@@ -107,27 +129,75 @@ class FileProcessingTab:
             self.on_config_changed
         )
         
+        # 切换标签页时补算被跳过的预览
+        self.parent_notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed, add='+')
+
         # 确保组件正确显示
         self.frame.update_idletasks()
         self.frame.update()
+
+    def _is_tab_visible(self) -> bool:
+        """当前是否为选中的标签页"""
+        try:
+            return self.parent_notebook.select() == str(self.frame)
+        except tk.TclError:
+            return True
+
+    def _on_tab_changed(self, event=None):
+        """标签页切换事件：补算可见时被跳过的预览"""
+        if self._preview_dirty and self._is_tab_visible():
+            self.preview_rename()
     
     # 事件处理方法
     def on_directory_selected(self, directory: str):
         """目录选择事件"""
-        try:
-            self.logic.scan_files(directory)
-            self.status_bar.update_status(f"找到 {len(self.logic.file_list)} 个媒体文件")
-            self.update_rule_info()
-            self.update_apply_info()
+        self._start_scan(directory, update_folder_info=True)
+
+    def _start_scan(self, directory: str, update_folder_info: bool = False):
+        """在工作线程中扫描目录，完成后回主线程刷新界面"""
+        if self._scan_thread is not None and self._scan_thread.is_alive():
+            self.status_bar.update_status("扫描进行中，请稍候...")
+            return
+
+        self.status_bar.update_status("正在扫描目录...")
+
+        def _scan():
+            try:
+                self.logic.scan_files(directory)
+                self.frame.after(0, self._finish_scan, update_folder_info, None)
+            except Exception as e:
+                self.frame.after(0, self._finish_scan, update_folder_info, str(e))
+
+        self._scan_thread = threading.Thread(target=_scan, daemon=True)
+        self._scan_thread.start()
+
+    def _finish_scan(self, update_folder_info: bool, error: Optional[str]):
+        """主线程：扫描完成后的界面刷新"""
+        if error is not None:
+            self.status_bar.update_status("扫描失败")
+            messagebox.showerror("错误", error)
+            return
+        self.status_bar.update_status(f"找到 {len(self.logic.file_list)} 个媒体文件")
+        self.update_rule_info()
+        self.update_apply_info()
+        if update_folder_info:
             self.update_folder_recognition()  # 更新文件夹识别信息
-            self.preview_rename()
-        except Exception as e:
-            messagebox.showerror("错误", str(e))
+        self.preview_rename()
     
     def on_rule_selected(self, event=None):
         """规则选择事件"""
         self.update_rule_info()
         self.update_apply_info()
+        self._schedule_preview()
+
+    def _schedule_preview(self, delay_ms: int = 150):
+        """防抖调度预览：取消未执行的预览请求，只保留最后一次"""
+        if self._preview_after_id is not None:
+            self.frame.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.frame.after(delay_ms, self._run_scheduled_preview)
+
+    def _run_scheduled_preview(self):
+        self._preview_after_id = None
         self.preview_rename()
     
     def on_validate_rules(self):
@@ -142,6 +212,7 @@ class FileProcessingTab:
             
             # 重新加载规则
             self.logic.reload_rules()
+            self._last_folder_recog_key = None
             
             # 更新界面
             self.rule_selector.update_rules(self.logic.rules)
@@ -157,23 +228,17 @@ class FileProcessingTab:
     
     def on_scan_files(self):
         """扫描文件事件"""
-        try:
-            directory = self.directory_selector.get_current_directory()
-            if not directory:
-                messagebox.showerror("错误", "请先选择目录")
-                return
-            
-            self.logic.scan_files(directory)
-            self.status_bar.update_status(f"找到 {len(self.logic.file_list)} 个媒体文件")
-            self.update_rule_info()
-            self.update_apply_info()
-            self.preview_rename()
-        except Exception as e:
-            messagebox.showerror("错误", str(e))
+        directory = self.directory_selector.get_current_directory()
+        if not directory:
+            messagebox.showerror("错误", "请先选择目录")
+            return
+
+        self._start_scan(directory)
     
     def on_clear_applied_rules(self):
         """清除应用规则事件"""
         self.logic.clear_all_applied_rules()
+        self._last_folder_recog_key = None
         self.preview_rename()
         self.update_apply_info()
         messagebox.showinfo("完成", "已清除所有应用规则")
@@ -208,10 +273,10 @@ class FileProcessingTab:
         """批量匹配规则事件"""
         try:
             # 执行自动匹配
-            auto_match_results = self.logic.batch_match_suggested_rules()
-            
-            # 统计匹配结果
-            matched_count = sum(1 for result in auto_match_results.values() if result['rule'])
+            self.logic.batch_match_suggested_rules()
+
+            # 统计匹配结果（匹配循环内已统计）
+            matched_count = self.logic.last_matched_count
             total_count = len(self.logic.file_list)
             
             # 显示匹配统计到状态栏
@@ -235,8 +300,8 @@ class FileProcessingTab:
     
     def on_title_change(self, custom_title: str):
         """剧集名变化事件"""
-        # 可以在这里添加实时预览逻辑
-        pass
+        # 防抖后实时预览，连续击键只触发最后一次
+        self._schedule_preview()
     
     def _apply_custom_settings(self, custom_title: str = None, custom_season: str = None):
         """统一的应用自定义设置方法"""
@@ -289,12 +354,8 @@ class FileProcessingTab:
                 return
             
             # 统计要重命名的文件
-            files_to_rename = []
-            for file_path in self.logic.file_list:
-                filename = file_path.name
-                if filename in self.logic.applied_rules:
-                    files_to_rename.append(file_path)
-            
+            files_to_rename = self.logic.get_files_to_rename()
+
             if not files_to_rename:
                 messagebox.showwarning("警告", "没有文件应用了规则")
                 return
@@ -310,27 +371,70 @@ class FileProcessingTab:
             
             # 获取自定义标题
             custom_title = self.title_editor.get_custom_title() or None
-            
-            # 执行重命名
-            result = self.logic.execute_rename(custom_title, self.status_bar.update_progress)
-            
-            # 显示结果
-            skipped_count = len(files_to_rename) - result['success_count'] - result['error_count']
-            self.result_handler.show_rename_results(
-                result['success_count'], 
-                result['error_count'], 
-                skipped_count, 
-                result['detailed_results']
-            )
-            
-            # 更新预览状态
-            self.preview_display.update_rename_status(result['detailed_results'])
-            
-            # 更新应用规则信息
-            self.update_apply_info()
-            
+
+            # 在工作线程中执行重命名，避免文件I/O阻塞Tk主循环
+            self._rename_queue = queue.Queue()
+            self._rename_total = len(files_to_rename)
+            self._rename_in_progress = True
+            threading.Thread(
+                target=self._execute_rename_worker,
+                args=(custom_title,),
+                daemon=True
+            ).start()
+            self.frame.after(50, self._poll_rename_queue)
+
         except Exception as e:
             messagebox.showerror("错误", str(e))
+
+    def _execute_rename_worker(self, custom_title: Optional[str]):
+        """工作线程：执行重命名并通过队列回传进度"""
+        try:
+            result = self.logic.execute_rename(
+                custom_title,
+                lambda *args: self._rename_queue.put(('progress', args))
+            )
+            self._rename_queue.put(('done', result))
+        except Exception as e:
+            self._rename_queue.put(('error', str(e)))
+
+    def _poll_rename_queue(self):
+        """主线程：轮询进度队列并更新界面"""
+        # 一次轮询可能积压多条进度，只渲染最后一条
+        latest_progress = None
+        try:
+            while True:
+                kind, payload = self._rename_queue.get_nowait()
+                if kind == 'progress':
+                    latest_progress = payload
+                elif kind == 'done':
+                    self._rename_in_progress = False
+                    self._on_rename_finished(payload)
+                    return
+                else:  # error
+                    self._rename_in_progress = False
+                    messagebox.showerror("错误", payload)
+                    return
+        except queue.Empty:
+            pass
+        if latest_progress is not None:
+            self.status_bar.update_progress(*latest_progress)
+        self.frame.after(50, self._poll_rename_queue)
+
+    def _on_rename_finished(self, result: dict):
+        """重命名完成后的界面更新"""
+        skipped_count = self._rename_total - result['success_count'] - result['error_count']
+        self.result_handler.show_rename_results(
+            result['success_count'],
+            result['error_count'],
+            skipped_count,
+            result['detailed_results']
+        )
+
+        # 更新预览状态
+        self.preview_display.update_rename_status(result['detailed_results'])
+
+        # 更新应用规则信息
+        self.update_apply_info()
     
     def on_restore_filenames(self):
         """恢复文件名事件"""
@@ -395,12 +499,16 @@ class FileProcessingTab:
     def preview_rename(self, custom_title: str = None, custom_season: str = None):
         """预览重命名"""
         try:
+            # 重命名执行中或标签页不可见时记脏标记，稍后再重建
+            if self._rename_in_progress or not self._is_tab_visible():
+                self._preview_dirty = True
+                return
+            self._preview_dirty = False
+
             if not self.logic.file_list:
+                self.preview_display.clear_preview()
                 return
-            
-            # 清空预览
-            self.preview_display.clear_preview()
-            
+
             # 获取自定义标题和季数
             if custom_title is None:
                 custom_title = self.title_editor.get_custom_title() or None
@@ -409,8 +517,9 @@ class FileProcessingTab:
             
             # 预览每个文件
             preview_results = self.logic.preview_rename(custom_title, custom_season)
-            
-            # 插入预览结果到树形控件
+
+            # 插入预览结果到树形控件（批量期间冻结树的重绘）
+            self.preview_display.begin_bulk()
             for preview_result in preview_results:
                 result = preview_result['result']
                 filename = preview_result['filename']
@@ -447,18 +556,24 @@ class FileProcessingTab:
                         folder_info
                     )
             
-            # 配置重复文件名的标签样式
-            self.preview_display.preview_tree.tag_configure('duplicate', foreground='red')
-            
+            # 删除已不在文件列表中的行（增量刷新只更新变化的行）
+            self.preview_display.prune_preview_items(
+                preview_result['filename'] for preview_result in preview_results
+            )
+
         except Exception as e:
             messagebox.showerror("错误", str(e))
+        finally:
+            self.preview_display.end_bulk()
     
     def on_config_changed(self):
         """配置变更事件"""
         try:
-            # 重新预览重命名结果
-            self.preview_rename()
-            self.status_bar.update_status("配置已更新，重新预览完成")
+            # 配置影响输出结果，预览/执行缓存全部作废
+            self.logic.clear_preview_caches()
+            # 重新预览重命名结果（防抖合并连续的配置修改）
+            self._schedule_preview()
+            self.status_bar.update_status("配置已更新，正在重新预览")
         except Exception as e:
             self.status_bar.update_status(f"配置更新失败: {e}")
     
@@ -466,27 +581,30 @@ class FileProcessingTab:
         """更新文件夹识别信息"""
         try:
             if self.logic.file_list:
-                # 获取当前应用的规则
-                applied_rules = {}
-                for filename in self.logic.file_list:
-                    if filename.name in self.logic.applied_rules:
-                        applied_rules[filename.name] = self.logic.applied_rules[filename.name]
-                
-                # 使用第一个文件的规则进行分析
-                if applied_rules:
-                    first_rule = list(applied_rules.values())[0]
-                    self.title_editor.analyze_files(self.logic.file_list, first_rule)
-                else:
-                    self.title_editor.analyze_files(self.logic.file_list, None)
+                # 使用第一个已应用规则进行分析，无需重建整个过滤字典
+                first_rule = next(iter(self.logic.applied_rules.values()), None)
+
+                # 输入状态未变时无需重新分析
+                key = (
+                    str(self.logic.file_list[0]),
+                    id(first_rule) if first_rule else 0,
+                    len(self.logic.applied_rules)
+                )
+                if key == self._last_folder_recog_key:
+                    return
+                self._last_folder_recog_key = key
+
+                self.title_editor.analyze_files(self.logic.file_list, first_rule)
             else:
+                self._last_folder_recog_key = None
                 self.title_editor._clear_folder_info()
-                
+
         except Exception as e:
             self.status_bar.update_status(f"更新文件夹识别失败: {e}")
     
     def update_rules(self, new_rules: List[RegexRule]):
         """更新规则列表"""
-        self.logic.rules = new_rules
+        self.logic.set_rules(new_rules)
         self.rule_selector.update_rules(new_rules)
         self.update_rule_info()
         self.preview_rename()
@@ -19,14 +19,23 @@ class HotReloadTab:
         self.parent_notebook = parent_notebook
         self.hot_reload_manager = hot_reload_manager
         self.main_window = main_window  # 添加主窗口引用
-        
+
+        # 已渲染到文本框的日志条数（增量刷新游标）
+        self._last_rendered = 0
+
         # 创建界面
         self.create_widgets()
-        
+
         # 初始化日志显示
         self.update_reload_log_display()
-        
-        # 设置定时器来定期更新日志显示
+
+        # 新日志通过观察者即时追加；低频定时器只兜底管理器外部的变更
+        self.hot_reload_manager.add_log_observer(self._on_new_log_entry)
+        # 界面销毁（如热重载重建）时注销观察者，避免残留死回调
+        self.frame.bind(
+            '<Destroy>',
+            lambda e: self.hot_reload_manager.remove_log_observer(self._on_new_log_entry)
+        )
         self.schedule_log_update()
     
     def create_widgets(self):
@@ -88,19 +97,42 @@ class HotReloadTab:
         self.hot_reload_manager.clear_reload_log()
         self.update_reload_log_display()
     
+    def _on_new_log_entry(self, log_entry: str):
+        """日志观察者回调（可能来自watchdog线程，转回Tk主线程追加）"""
+        try:
+            self.frame.after(0, self._append_log_entry, log_entry)
+        except tk.TclError:
+            # 界面已销毁
+            pass
+
+    def _append_log_entry(self, log_entry: str):
+        """主线程：追加单条日志"""
+        try:
+            self.reload_log_text.insert(tk.END, log_entry + "\n")
+            self.reload_log_text.see(tk.END)
+            self._last_rendered += 1
+        except tk.TclError:
+            pass
+
     def schedule_log_update(self):
-        """设置定时器来定期更新日志显示"""
+        """低频兜底刷新，处理观察者之外的日志变更（如外部清空）"""
         self.update_reload_log_display()
-        # 每500毫秒更新一次日志显示
-        self.frame.after(500, self.schedule_log_update)
+        # 每2秒兜底同步一次
+        self.frame.after(2000, self.schedule_log_update)
     
     def update_reload_log_display(self):
-        """更新重载日志显示"""
+        """更新重载日志显示（只渲染未显示的尾部）"""
         try:
-            self.reload_log_text.delete(1.0, tk.END)
-            for log_entry in self.hot_reload_manager.reload_log:
-                self.reload_log_text.insert(tk.END, log_entry + "\n")
-            self.reload_log_text.see(tk.END)
-        except Exception as e:
+            log = self.hot_reload_manager.reload_log
+            if len(log) < self._last_rendered:
+                # 日志被清空或截断，整体重建
+                self.reload_log_text.delete(1.0, tk.END)
+                self._last_rendered = 0
+            new_entries = list(log)[self._last_rendered:]
+            if new_entries:
+                self.reload_log_text.insert(tk.END, "\n".join(new_entries) + "\n")
+                self.reload_log_text.see(tk.END)
+                self._last_rendered += len(new_entries)
+        except Exception:
             # 如果界面已经被销毁，忽略错误
             pass
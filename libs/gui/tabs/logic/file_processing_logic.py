@@ -4,16 +4,26 @@
 文件处理业务逻辑
 """
 
+import os
+import sys
+import time
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
-from collections import Counter
 
 from libs.core.rule import RegexRule, RuleFileManager
-from libs.core.file_manager import FileManager
-from libs.core.renamer import MediaRenamer
-from libs.core.auto_matcher import RuleMatcher
+
+# FileManager/MediaRenamer/RuleMatcher 延迟到首次使用时导入，
+# 缩短GUI首屏前的导入与实例化成本
+
+
+# 预览结果中大量重复的状态字符串，驻留后每个值只占一个对象
+_STATUS_APPLIED = sys.intern("已应用规则")
+_STATUS_APPLY_FAILED = sys.intern("应用规则失败")
+_STATUS_NO_RULE = sys.intern("未应用规则")
+_NO_RULE_NAME = sys.intern("无")
+_NO_MATCH_INFO = sys.intern("请先应用规则")
 
 
 class FileProcessingLogic:
@@ -22,38 +32,91 @@ class FileProcessingLogic:
     def __init__(self, rule_manager: RuleFileManager, rules: List[RegexRule]):
         self.rule_manager = rule_manager
         self.rules = rules
+        self._rules_by_name = {rule.name: rule for rule in rules}
         
-        # 核心组件
-        self.file_manager = FileManager()
-        self.renamer = MediaRenamer()
-        self.rule_matcher = RuleMatcher()
+        # 核心组件（懒加载，见同名property）
+        self._file_manager = None
+        self._renamer = None
+        self._rule_matcher = None
         
         # 数据
         self.current_dir = ""
         self.file_list: List[Path] = []
+        self.file_names: List[str] = []  # 与file_list平行的文件名缓存
         self.auto_match_results = {}
-        self.applied_rules = {}  # 存储每个文件应用的规则
-    
+        self.last_matched_count = 0  # 最近一次自动匹配的命中数
+        self.applied_rules: Dict[Path, RegexRule] = {}  # 存储每个文件应用的规则（按路径索引）
+        self._name_index: Dict[str, Path] = {}  # 文件名 -> 路径索引
+        self._score_cache: Dict[tuple, float] = {}  # (规则名, 文件名) -> 匹配分数
+        # 预览算好的结果供执行阶段直接复用：(规则名, 文件名, 标题, 季数) -> (成功, 新名, 匹配信息)
+        self._exec_cache: Dict[tuple, tuple] = {}
+
+    @property
+    def file_manager(self):
+        """文件管理器（首次使用时导入并实例化）"""
+        if self._file_manager is None:
+            from libs.core.file_manager import FileManager
+            self._file_manager = FileManager()
+        return self._file_manager
+
+    @property
+    def renamer(self):
+        """重命名器（首次使用时导入并实例化）"""
+        if self._renamer is None:
+            from libs.core.renamer import MediaRenamer
+            self._renamer = MediaRenamer()
+        return self._renamer
+
+    @property
+    def rule_matcher(self):
+        """规则匹配器（首次使用时导入并实例化）"""
+        if self._rule_matcher is None:
+            from libs.core.auto_matcher import RuleMatcher
+            self._rule_matcher = RuleMatcher()
+        return self._rule_matcher
+
     def scan_files(self, directory: str) -> List[Path]:
         """扫描文件"""
         if not directory:
             raise ValueError("请选择有效的目录")
-        
+
         self.current_dir = directory
+        self._score_cache.clear()
+        self._exec_cache.clear()
         self.file_list = self.file_manager.scan_media_files(directory)
+        # SoA布局：文件名列表与file_list平行，热循环避免重复取Path.name
+        self.file_names = [p.name for p in self.file_list]
+        self._name_index = dict(zip(self.file_names, self.file_list))
         return self.file_list
+
+    def clear_preview_caches(self):
+        """配置变更等外部因素使缓存失效时调用"""
+        self._score_cache.clear()
+        self._exec_cache.clear()
+
+    def get_file_by_name(self, filename: str) -> Optional[Path]:
+        """根据文件名查找路径（O(1)索引查找）"""
+        return self._name_index.get(filename)
+
+    def get_files_to_rename(self) -> List[Path]:
+        """获取已应用规则的文件列表（保持扫描顺序）"""
+        return [p for p in self.file_list if p in self.applied_rules]
     
     def reload_rules(self) -> List[RegexRule]:
         """重新加载规则"""
-        self.rules = self.rule_manager.load_all_rules()
+        self.set_rules(self.rule_manager.load_all_rules())
         return self.rules
-    
+
+    def set_rules(self, rules: List[RegexRule]):
+        """替换规则列表并重建名称索引"""
+        self.rules = rules
+        self._rules_by_name = {rule.name: rule for rule in rules}
+        self._score_cache.clear()
+        self._exec_cache.clear()
+
     def get_rule_by_name(self, rule_name: str) -> Optional[RegexRule]:
         """根据名称获取规则"""
-        for rule in self.rules:
-            if rule.name == rule_name:
-                return rule
-        return None
+        return self._rules_by_name.get(rule_name)
     
     def batch_match_suggested_rules(self) -> Dict[str, Dict]:
         """批量匹配建议规则"""
@@ -66,11 +129,14 @@ class FileProcessingLogic:
         # 执行自动匹配
         self.auto_match_results = self.rule_matcher.auto_match_files(self.file_list, self.rules)
         
-        # 应用自动匹配的规则
-        for filename, auto_result in self.auto_match_results.items():
+        # 应用自动匹配的规则（同一循环内统计命中数，避免再扫一遍）
+        matched_count = 0
+        for auto_result in self.auto_match_results.values():
             if auto_result['rule']:
-                self.applied_rules[filename] = auto_result['rule']
-        
+                self.applied_rules[auto_result['file_path']] = auto_result['rule']
+                matched_count += 1
+        self.last_matched_count = matched_count
+
         return self.auto_match_results
     
     def apply_rules_auto_first(self) -> bool:
@@ -78,17 +144,17 @@ class FileProcessingLogic:
         if not self.file_list:
             raise ValueError("没有文件需要处理")
         
-        used_auto = False
-        # 优先使用自动匹配结果
-        if hasattr(self, 'auto_match_results') and self.auto_match_results:
-            for filename, result in self.auto_match_results.items():
-                rule = result.get('rule')
-                file_path = result.get('file_path')
-                if rule and file_path:
-                    self.applied_rules[filename] = rule
-                    used_auto = True
-        
-        return used_auto
+        # 优先使用自动匹配结果（__init__保证属性存在，无需hasattr）
+        matched = {
+            result['file_path']: result['rule']
+            for result in self.auto_match_results.values()
+            if result.get('rule') and result.get('file_path')
+        }
+        if not matched:
+            return False
+
+        self.applied_rules.update(matched)
+        return True
     
     def apply_manual_rule(self, rule_name: str):
         """应用手动选择的规则"""
@@ -100,8 +166,7 @@ class FileProcessingLogic:
             raise ValueError("规则不存在")
         
         for file_path in self.file_list:
-            filename = file_path.name
-            self.applied_rules[filename] = selected_rule
+            self.applied_rules[file_path] = selected_rule
     
     def clear_all_applied_rules(self):
         """清除所有应用规则"""
@@ -118,38 +183,64 @@ class FileProcessingLogic:
         
         preview_results = []
         new_filenames = []
-        
-        # 预览每个文件
+
+        # 按应用的规则分组，每条规则只调用一次批量预览
+        rule_groups: Dict[int, List[Path]] = {}
+        rules_by_id: Dict[int, RegexRule] = {}
         for file_path in self.file_list:
-            filename = file_path.name
-            
+            rule = self.applied_rules.get(file_path)
+            if rule is not None:
+                rule_groups.setdefault(id(rule), []).append(file_path)
+                rules_by_id[id(rule)] = rule
+
+        results_by_name: Dict[str, Dict] = {}
+        for rule_id, paths in rule_groups.items():
+            rule = rules_by_id[rule_id]
+            for batch_result in self.renamer.preview_rename(paths, rule, custom_title, custom_season):
+                name = batch_result['original_name']
+                results_by_name[name] = batch_result
+                # 预览结果缓存给执行阶段，同参数时不再重算
+                self._exec_cache[(rule.name, name, custom_title, custom_season)] = (
+                    batch_result['success'],
+                    batch_result['new_name'],
+                    batch_result['match_info']
+                )
+
+        # 按扫描顺序组装预览结果（热循环内绑定局部变量，减少属性链查找）
+        applied = self.applied_rules
+        score_cache = self._score_cache
+        calc_score = self.rule_matcher.calculate_rule_score
+        get_result = results_by_name.get
+        for file_path, filename in zip(self.file_list, self.file_names):
             # 检查是否有应用的规则
-            if filename in self.applied_rules:
-                applied_rule = self.applied_rules[filename]
-                # 使用应用的规则进行预览
-                results = self.renamer.preview_rename([file_path], applied_rule, custom_title, custom_season)
-                if results:
-                    result = results[0]
-                    status = "已应用规则"
-                    applied_rule_name = applied_rule.name
+            applied_rule = applied.get(file_path)
+            if applied_rule is not None:
+                result = get_result(filename)
+                if result:
+                    status = _STATUS_APPLIED
+                    applied_rule_name = sys.intern(applied_rule.name)
                     match_info = str(result['match_info'])
-                    # 计算匹配分数
-                    match_score = self.rule_matcher.calculate_rule_score(applied_rule, filename)
+                    # 计算匹配分数（同一(规则,文件)在多次预览间缓存）
+                    score_key = (applied_rule.name, filename)
+                    match_score = score_cache.get(score_key)
+                    if match_score is None:
+                        match_score = calc_score(applied_rule, filename)
+                        score_cache[score_key] = match_score
                     match_score = f"{match_score:.1f}" if match_score > 0 else "0.0"
                     new_filename = result['new_name']
                 else:
                     result = None
-                    status = "应用规则失败"
-                    applied_rule_name = applied_rule.name
+                    status = _STATUS_APPLY_FAILED
+                    applied_rule_name = sys.intern(applied_rule.name)
                     match_info = "无匹配"
                     match_score = "0.0"
                     new_filename = filename
             else:
                 # 没有应用规则
                 result = None
-                status = "未应用规则"
-                applied_rule_name = "无"
-                match_info = "请先应用规则"
+                status = _STATUS_NO_RULE
+                applied_rule_name = _NO_RULE_NAME
+                match_info = _NO_MATCH_INFO
                 match_score = "N/A"
                 new_filename = filename
             
@@ -166,19 +257,21 @@ class FileProcessingLogic:
             
             new_filenames.append(new_filename)
         
-        # 检测重复的新文件名
-        filename_counts = Counter(new_filenames)
-        duplicate_filenames = {name for name, count in filename_counts.items() if count > 1}
-        
-        # 标记重复文件名
+        # 检测重复的新文件名（单次计数，直接按计数标记）
+        name_counts: Dict[str, int] = {}
+        for name in new_filenames:
+            name_counts[name] = name_counts.get(name, 0) + 1
+
         for preview_result in preview_results:
-            preview_result['is_duplicate'] = preview_result['new_filename'] in duplicate_filenames
-        
+            preview_result['is_duplicate'] = name_counts[preview_result['new_filename']] > 1
+
         return preview_results
     
     def execute_rename(self, custom_title: Optional[str] = None, 
                       progress_callback: Optional[Callable] = None) -> Dict:
         """执行重命名"""
+        from libs.core.renamer import RenameResult
+
         if not self.file_list:
             raise ValueError("没有文件需要处理")
         
@@ -187,133 +280,125 @@ class FileProcessingLogic:
             raise ValueError("没有应用任何规则，请先应用规则")
         
         # 统计要重命名的文件
-        files_to_rename = []
-        for file_path in self.file_list:
-            filename = file_path.name
-            if filename in self.applied_rules:
-                files_to_rename.append(file_path)
-        
+        files_to_rename = self.get_files_to_rename()
+
         if not files_to_rename:
             raise ValueError("没有文件应用了规则")
         
         success_count = 0
         error_count = 0
         detailed_results = []
-        
-        # 执行重命名
+        # 按目录累积日志记录，循环结束后一次性写入
+        pending_logs: Dict[str, List[Dict]] = {}
+
+        # 进度回调节流（约30Hz）：失败/跳过分支和最后一个文件必报
+        _last_progress = [0.0]
+
+        def _report_progress(current: int, total: int, fname: str, status: str,
+                             force: bool = False):
+            if progress_callback is None:
+                return
+            now = time.monotonic()
+            if force or current == total or now - _last_progress[0] >= 0.033:
+                progress_callback(current, total, fname, status)
+                _last_progress[0] = now
+
+        def _queue_log(directory: str, old_name: str, new_name: str,
+                       rule_name: str, status: str, reason: str):
+            pending_logs.setdefault(directory, []).append({
+                'old_name': old_name,
+                'new_name': new_name,
+                'rule_name': rule_name,
+                'status': status,
+                'reason': reason
+            })
+
+        # 按父目录一次性列目录，存在性检查退化为集合成员测试
+        existing_by_dir: Dict[str, set] = {}
+        for file_path in files_to_rename:
+            parent = os.path.dirname(os.fspath(file_path))
+            if parent not in existing_by_dir:
+                try:
+                    existing_by_dir[parent] = set(os.listdir(parent))
+                except OSError:
+                    existing_by_dir[parent] = set()
+
+        # 执行重命名（热循环内使用字符串路径，避免每个文件构造Path对象）
         for i, file_path in enumerate(files_to_rename):
             filename = file_path.name
-            applied_rule = self.applied_rules[filename]
-            
+            applied_rule = self.applied_rules[file_path]
+            file_path_str = os.fspath(file_path)
+            parent_str = os.path.dirname(file_path_str)
+
             try:
                 # 更新进度
-                if progress_callback:
-                    progress_callback(i + 1, len(files_to_rename), filename, "处理中...")
+                _report_progress(i + 1, len(files_to_rename), filename, "处理中...")
                 
-                # 执行重命名
-                success, new_filename, match_info = self.renamer.match_filename_with_rule(filename, applied_rule, custom_title, str(file_path), None)
+                # 执行重命名（优先复用预览阶段算好的结果）
+                cached = self._exec_cache.get((applied_rule.name, filename, custom_title, None))
+                if cached is not None:
+                    success, new_filename, match_info = cached
+                else:
+                    success, new_filename, match_info = self.renamer.match_filename_with_rule(
+                        filename, applied_rule, custom_title, str(file_path), None)
                 
                 if success:
-                    new_path = file_path.parent / new_filename
-                    if new_path.exists() and new_path != file_path:
+                    existing = existing_by_dir[parent_str]
+                    if new_filename in existing and new_filename != filename:
                         # 目标文件已存在 - 记录跳过操作
-                        self.file_manager.log_rename(
-                            str(file_path.parent), 
-                            filename, 
-                            new_filename, 
-                            applied_rule.name,
-                            "跳过",
-                            "目标文件已存在"
-                        )
-                        detailed_results.append({
-                            'original_name': filename,
-                            'new_name': new_filename,
-                            'status': '跳过',
-                            'reason': '目标文件已存在'
-                        })
-                        if progress_callback:
-                            progress_callback(i + 1, len(files_to_rename), filename, "跳过 - 目标文件已存在")
+                        _queue_log(parent_str, filename, new_filename,
+                                   applied_rule.name, "跳过", "目标文件已存在")
+                        detailed_results.append(RenameResult(
+                            filename, new_filename, '跳过', '目标文件已存在'))
+                        _report_progress(i + 1, len(files_to_rename), filename,
+                                         "跳过 - 目标文件已存在", force=True)
                     elif self.file_manager.rename_file(file_path, new_filename):
                         # 重命名成功 - 记录成功操作
-                        self.file_manager.log_rename(
-                            str(file_path.parent), 
-                            filename, 
-                            new_filename, 
-                            applied_rule.name,
-                            "成功",
-                            "重命名成功"
-                        )
+                        _queue_log(parent_str, filename, new_filename,
+                                   applied_rule.name, "成功", "重命名成功")
+                        existing.discard(filename)
+                        existing.add(new_filename)
                         success_count += 1
-                        detailed_results.append({
-                            'original_name': filename,
-                            'new_name': new_filename,
-                            'status': '成功',
-                            'reason': '重命名成功'
-                        })
-                        if progress_callback:
-                            progress_callback(i + 1, len(files_to_rename), filename, "成功")
+                        detailed_results.append(RenameResult(
+                            filename, new_filename, '成功', '重命名成功'))
+                        _report_progress(i + 1, len(files_to_rename), filename, "成功")
                     else:
                         # 文件系统错误 - 记录失败操作
-                        self.file_manager.log_rename(
-                            str(file_path.parent), 
-                            filename, 
-                            new_filename, 
-                            applied_rule.name,
-                            "失败",
-                            "文件系统错误"
-                        )
+                        _queue_log(parent_str, filename, new_filename,
+                                   applied_rule.name, "失败", "文件系统错误")
                         error_count += 1
-                        detailed_results.append({
-                            'original_name': filename,
-                            'new_name': new_filename,
-                            'status': '失败',
-                            'reason': '文件系统错误'
-                        })
-                        if progress_callback:
-                            progress_callback(i + 1, len(files_to_rename), filename, "失败 - 文件系统错误")
+                        detailed_results.append(RenameResult(
+                            filename, new_filename, '失败', '文件系统错误'))
+                        _report_progress(i + 1, len(files_to_rename), filename,
+                                         "失败 - 文件系统错误", force=True)
                 else:
                     # 规则匹配失败 - 记录失败操作
-                    self.file_manager.log_rename(
-                        str(file_path.parent), 
-                        filename, 
-                        filename, 
-                        applied_rule.name,
-                        "失败",
-                        "规则匹配失败"
-                    )
+                    _queue_log(parent_str, filename, filename,
+                               applied_rule.name, "失败", "规则匹配失败")
                     error_count += 1
-                    detailed_results.append({
-                        'original_name': filename,
-                        'new_name': filename,
-                        'status': '失败',
-                        'reason': '规则匹配失败'
-                    })
-                    if progress_callback:
-                        progress_callback(i + 1, len(files_to_rename), filename, "失败 - 规则匹配失败")
+                    detailed_results.append(RenameResult(
+                        filename, filename, '失败', '规则匹配失败'))
+                    _report_progress(i + 1, len(files_to_rename), filename,
+                                     "失败 - 规则匹配失败", force=True)
                     
             except Exception as e:
                 # 异常情况 - 记录失败操作
-                self.file_manager.log_rename(
-                    str(file_path.parent), 
-                    filename, 
-                    filename, 
-                    applied_rule.name if applied_rule else "未知",
-                    "失败",
-                    f"异常: {str(e)}"
-                )
+                _queue_log(parent_str, filename, filename,
+                           applied_rule.name if applied_rule else "未知",
+                           "失败", f"异常: {str(e)}")
                 error_count += 1
-                detailed_results.append({
-                    'original_name': filename,
-                    'new_name': filename,
-                    'status': '失败',
-                    'reason': f'异常: {str(e)}'
-                })
-                if progress_callback:
-                    progress_callback(i + 1, len(files_to_rename), filename, f"失败 - {str(e)}")
+                detailed_results.append(RenameResult(
+                    filename, filename, '失败', f'异常: {str(e)}'))
+                _report_progress(i + 1, len(files_to_rename), filename,
+                                 f"失败 - {str(e)}", force=True)
         
+        # 一次性写入本次运行的全部日志记录
+        for directory, entries in pending_logs.items():
+            self.file_manager.log_rename_bulk(directory, entries)
+
         # 清除应用的规则
         self.applied_rules.clear()
-        
+
         return {
             'success_count': success_count,
             'error_count': error_count,
@@ -9,6 +9,9 @@ from tkinter import ttk, messagebox, scrolledtext
 from pathlib import Path
 from typing import List, Dict
 from datetime import datetime
+from collections import Counter
+
+from libs.core.renamer import RenameResult
 
 
 class ResultHandler:
@@ -17,42 +20,47 @@ class ResultHandler:
     def __init__(self, parent_frame: ttk.Frame):
         self.parent_frame = parent_frame
     
-    def show_rename_results(self, success_count: int, error_count: int, 
-                          skipped_count: int, detailed_results: List[Dict]):
+    def show_rename_results(self, success_count: int, error_count: int,
+                          skipped_count: int, detailed_results: List['RenameResult']):
         """显示重命名结果"""
         # 确保detailed_results是列表
         if not isinstance(detailed_results, list):
             detailed_results = []
         
-        # 统计各种状态
+        # 单次遍历同时统计状态和收集失败文件
         status_counts = {}
+        failed_results = []
         for result in detailed_results:
-            if isinstance(result, dict) and 'status' in result:
-                status = result['status']
-                status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # 构建结果文本
-        result_text = f"重命名完成！\n\n"
-        result_text += f"总文件数: {success_count + error_count + skipped_count}\n"
-        result_text += f"成功: {success_count}\n"
-        result_text += f"失败: {error_count}\n"
-        result_text += f"跳过: {skipped_count}\n\n"
-        
+            status = result.status
+            status_counts[status] = status_counts.get(status, 0) + 1
+            if status == '失败':
+                failed_results.append(result)
+        
+        # 构建结果文本（join一次拼接，避免重复字符串复制）
+        parts = [
+            "重命名完成！",
+            "",
+            f"总文件数: {success_count + error_count + skipped_count}",
+            f"成功: {success_count}",
+            f"失败: {error_count}",
+            f"跳过: {skipped_count}",
+            ""
+        ]
+
         # 添加详细状态统计
         if status_counts:
-            result_text += "详细状态:\n"
-            for status, count in status_counts.items():
-                result_text += f"  {status}: {count}\n"
+            parts.append("详细状态:")
+            parts.extend(f"  {status}: {count}" for status, count in status_counts.items())
+        result_text = "\n".join(parts) + "\n"
         
         # 显示结果对话框
         messagebox.showinfo("重命名完成", result_text)
         
         # 如果有失败的文件，显示详细错误信息
-        failed_results = [r for r in detailed_results if isinstance(r, dict) and r.get('status') == '失败']
         if failed_results:
             self.show_failed_files_details(failed_results)
     
-    def show_failed_files_details(self, failed_results: List[Dict]):
+    def show_failed_files_details(self, failed_results: List['RenameResult']):
         """显示失败文件的详细信息"""
         if not failed_results:
             return
@@ -69,13 +77,16 @@ class ResultHandler:
         text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD)
         text_widget.pack(fill=tk.BOTH, expand=True)
         
-        # 添加失败文件信息
-        text_widget.insert(tk.END, f"失败文件详情 ({len(failed_results)} 个文件):\n\n")
-        
-        for i, result in enumerate(failed_results, 1):
-            text_widget.insert(tk.END, f"{i}. 文件: {result['original_name']}\n")
-            text_widget.insert(tk.END, f"   原因: {result['reason']}\n")
-            text_widget.insert(tk.END, f"   匹配信息: {result.get('match_info', '无')}\n\n")
+        # 添加失败文件信息（整体拼接后一次插入，避免逐行触发重排版）
+        header = f"失败文件详情 ({len(failed_results)} 个文件):\n\n"
+        body = "\n".join(
+            f"{i}. 文件: {result.original_name}\n"
+            f"   原因: {result.reason}\n"
+            f"   匹配信息: {result.match_info}\n"
+            for i, result in enumerate(failed_results, 1)
+        )
+        text_widget.insert(tk.END, header + body)
+        text_widget.configure(state=tk.DISABLED)
         
         # 添加关闭按钮
         button_frame = ttk.Frame(detail_window)
@@ -126,16 +137,19 @@ class ResultHandler:
         scrollbar = ttk.Scrollbar(detail_frame, orient=tk.VERTICAL, command=tree.yview)
         tree.configure(yscrollcommand=scrollbar.set)
         
-        # 插入数据
+        # 插入数据（直接走Tcl调用，跳过ttk包装层的参数处理；
+        # 树尚未挂载到布局，批量插入不会触发逐行重绘）
+        _insert = tree.tk.call
+        tree_path = str(tree)
         for result in detailed_results:
-            old_name = result.get('old_name', '')
-            new_name = result.get('new_name', '')
-            status = result.get('status', '')
-            reason = result.get('reason', '')
-            
-            tree.insert("", "end", values=(old_name, new_name, status, reason))
-        
-        # 布局
+            _insert(tree_path, 'insert', '', 'end', '-values', (
+                result.get('old_name', ''),
+                result.get('new_name', ''),
+                result.get('status', ''),
+                result.get('reason', '')
+            ))
+
+        # 布局（插入完成后一次性挂载）
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
@@ -177,32 +191,49 @@ class ResultHandler:
         
         # 添加滚动条
         scrollbar = ttk.Scrollbar(log_window, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
-        # 插入记录数据
+
+        # 预计算所有行（单次遍历）
+        _fromiso = datetime.fromisoformat
+        rows = []
         for record in rename_log:
             timestamp = record.get('timestamp', '')
-            old_name = record.get('old_name', '')
-            new_name = record.get('new_name', '')
-            status = record.get('status', '')
-            reason = record.get('reason', '')
-            rule_name = record.get('rule_name', '')
-            
-            # 格式化时间
-            try:
-                dt = datetime.fromisoformat(timestamp)
-                formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-            except:
-                formatted_time = timestamp
-            
-            tree.insert("", "end", values=(
+            # 格式化时间：ISO产出的时间戳直接切片，异常路径只留给畸形数据
+            if len(timestamp) >= 19 and timestamp[4] == '-' and timestamp[10] == 'T':
+                formatted_time = f"{timestamp[:10]} {timestamp[11:19]}"
+            else:
+                try:
+                    formatted_time = _fromiso(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+                except (ValueError, TypeError):
+                    formatted_time = timestamp
+            rows.append((
                 formatted_time,
-                old_name,
-                new_name,
-                status,
-                reason,
-                rule_name
+                record.get('old_name', ''),
+                record.get('new_name', ''),
+                record.get('status', ''),
+                record.get('reason', ''),
+                record.get('rule_name', '')
             ))
+
+        # 分页插入：先插入第一页，滚动接近底部时再物化下一页
+        page_size = 200
+        state = {'next': 0}
+
+        _insert = tree.tk.call
+        tree_path = str(tree)
+
+        def _insert_next_page():
+            end = min(state['next'] + page_size, len(rows))
+            for row in rows[state['next']:end]:
+                _insert(tree_path, 'insert', '', 'end', '-values', row)
+            state['next'] = end
+
+        def _on_scroll(first, last):
+            scrollbar.set(first, last)
+            if state['next'] < len(rows) and float(last) > 0.9:
+                _insert_next_page()
+
+        tree.configure(yscrollcommand=_on_scroll)
+        _insert_next_page()
         
         # 布局
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -212,9 +243,11 @@ class ResultHandler:
         stats_frame = ttk.Frame(log_window)
         stats_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        success_count = sum(1 for r in rename_log if r.get('status') == '成功')
-        failed_count = sum(1 for r in rename_log if r.get('status') == '失败')
-        skipped_count = sum(1 for r in rename_log if r.get('status') == '跳过')
+        # 一次遍历统计全部状态
+        status_counts = Counter(r.get('status', '') for r in rename_log)
+        success_count = status_counts.get('成功', 0)
+        failed_count = status_counts.get('失败', 0)
+        skipped_count = status_counts.get('跳过', 0)
         
         stats_text = f"总计: {len(rename_log)} | 成功: {success_count} | 失败: {failed_count} | 跳过: {skipped_count}"
         ttk.Label(stats_frame, text=stats_text).pack()
@@ -62,13 +62,17 @@ class RuleManagementTab:
     
     def refresh_rules_list(self):
         """刷新规则列表显示"""
-        # 清空现有项目
-        for item in self.rules_tree.get_children():
-            self.rules_tree.delete(item)
-        
+        # 刷新期间把树摘出布局，整批删除/插入只触发一次重绘
+        self.rules_tree.pack_forget()
+        children = self.rules_tree.get_children()
+        if children:
+            self.rules_tree.delete(*children)
+
         # 添加规则
         for rule in self.rules:
             self.rules_tree.insert('', tk.END, values=(rule.name, rule.pattern))
+
+        self.rules_tree.pack(fill=tk.BOTH, expand=True)
     
     def delete_rule(self):
         """删除规则"""
@@ -5,19 +5,33 @@
 负责正则表达式测试和规则创建
 """
 
+import functools
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from pathlib import Path
 import json
 import re
+import string
 from typing import List
 
-from libs.core.rule import RegexRule, RuleFileManager
+from libs.core.rule import RegexRule, RuleFileManager, _longest_required_literal
 from libs.core.file_manager import FileManager
 from libs.core.auto_matcher import RuleMatcher
 from libs.config import TREEVIEW_COLUMN_WIDTH, TEST_DEFAULT_FILENAME, TEST_DEFAULT_REGEX, TEST_DEFAULT_GROUPS, TEST_DEFAULT_FORMAT
 
 
+@functools.lru_cache(maxsize=4096)
+def _compile(pattern: str, flags: int = 0):
+    """模块级正则编译缓存
+
+    不依赖re模块内部约512条的共享缓存——自动匹配测试会让几十条规则与
+    用户输入的模式竞争同一个缓存导致抖动。需要时可用 _compile.cache_clear()。
+    """
+    return re.compile(pattern, flags)
+
+
 class RuleTestingTab:
     """规则测试标签页"""
     
@@ -33,6 +47,30 @@ class RuleTestingTab:
         # 数据
         self.test_dir = ""
         self.test_file_list: List[Path] = []
+        self._rules_by_name = {rule.name: rule for rule in rules}
+        # SoA布局：文件名/扩展名与test_file_list平行，热循环免去Path属性重算
+        self._names: tuple = ()
+        self._suffixes: tuple = ()
+
+        # 击键防抖：合并连续编辑，只处理最终状态
+        self._pending_job = None
+        self._refresh_files_pending = False
+
+        # 文件列表行的iid缓存：行数不变时原位更新而不是删除重建
+        self._row_iids: List[str] = []
+        self._row_state: List[tuple] = []  # 上次渲染的行内容，用于跳过未变化的行
+
+        # 大列表的行计算放到工作线程，代号用于丢弃过期结果
+        self._compute_generation = 0
+
+        # 目录扫描缓存：目录mtime未变时复用上次扫描结果
+        self._scan_cache: dict = {}
+
+        # 组映射JSON的最近一次成功解析结果
+        self._last_groups_parse = None
+
+        # 标签页不可见时跳过列表刷新，切回时补算
+        self._display_dirty = False
         
         # 创建界面
         self.create_widgets()
@@ -75,6 +113,21 @@ class RuleTestingTab:
         
         # 测试按钮
         self.create_button_section()
+
+        # 切换标签页时补算被跳过的列表刷新
+        self.parent_notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed, add='+')
+
+    def _is_tab_visible(self) -> bool:
+        """当前是否为选中的标签页"""
+        try:
+            return self.parent_notebook.select() == str(self.frame)
+        except tk.TclError:
+            return True
+
+    def _on_tab_changed(self, event=None):
+        """标签页切换事件：补算可见时被跳过的刷新"""
+        if self._display_dirty and self._is_tab_visible():
+            self.update_test_files_display()
     
     def create_directory_section(self):
         """创建目录选择区域"""
@@ -126,10 +179,11 @@ class RuleTestingTab:
     def refresh_rule_list(self):
         """刷新规则列表"""
         try:
-            self.rule_manager = RuleFileManager()
+            # 复用已有的管理器，load_all_rules 在目录未变时命中缓存
             self.rules = self.rule_manager.load_all_rules()
-            
-            rule_names = [rule.name for rule in self.rules]
+            self._rules_by_name = {rule.name: rule for rule in self.rules}
+
+            rule_names = list(self._rules_by_name.keys())
             self.rule_combo['values'] = rule_names
             
             if rule_names and not self.selected_rule_var.get():
@@ -149,23 +203,19 @@ class RuleTestingTab:
         selected_name = self.selected_rule_var.get()
         if not selected_name:
             return
-        
-        # 找到对应的规则
-        selected_rule = None
-        for rule in self.rules:
-            if rule.name == selected_name:
-                selected_rule = rule
-                break
-        
+
+        # O(1)名称索引查找
+        selected_rule = self._rules_by_name.get(selected_name)
+
         if selected_rule:
             # 加载规则内容到编辑区域
             self.rule_name_var.set(selected_rule.name)
             self.test_regex_var.set(selected_rule.pattern)
             self.test_groups_var.set(json.dumps(selected_rule.groups, ensure_ascii=False, indent=2))
             self.test_format_var.set(selected_rule.output_format)
-            
+
             # 触发测试
-            self.test_single_file()
+            self._schedule_refresh()
     
     def save_current_rule(self):
         """保存当前规则"""
@@ -346,63 +396,147 @@ class RuleTestingTab:
         """扫描测试目录中的文件"""
         if not self.test_dir:
             return
-        
-        self.test_file_list = self.file_manager.scan_media_files(self.test_dir)
+
+        # 目录mtime未变时跳过重新扫描（重命名/增删文件都会改变目录mtime）
+        try:
+            cache_key = (self.test_dir, os.stat(self.test_dir).st_mtime_ns)
+        except OSError:
+            cache_key = None
+
+        if cache_key is not None and cache_key in self._scan_cache:
+            self.test_file_list = self._scan_cache[cache_key]
+        else:
+            self.test_file_list = self.file_manager.scan_media_files(self.test_dir)
+            if cache_key is not None:
+                self._scan_cache.clear()
+                self._scan_cache[cache_key] = self.test_file_list
+
+        # 平行的名称/扩展名元组只在扫描时计算一次
+        self._names = tuple(p.name for p in self.test_file_list)
+        self._suffixes = tuple(p.suffix for p in self.test_file_list)
+
         # 更新文件列表显示
         self.update_test_files_display()
     
     def update_test_files_display(self):
         """更新测试文件列表显示"""
-        # 清空现有项目
-        for item in self.test_files_tree.get_children():
-            self.test_files_tree.delete(item)
-        
-        if not self.test_file_list:
+        # 标签页不可见时记脏标记，切回时再重建
+        if not self._is_tab_visible():
+            self._display_dirty = True
             return
-        
-        # 获取当前正则表达式和格式
+        self._display_dirty = False
+
+        # Tk变量必须在主线程读取，循环计算可以下放工作线程
         regex_pattern = self.test_regex_var.get().strip()
         groups_str = self.test_groups_var.get().strip()
         output_format = self.test_format_var.get().strip()
-        
+
+        # SoA缓存在主线程同步好，工作线程只读
+        if len(self._names) != len(self.test_file_list):
+            self._names = tuple(p.name for p in self.test_file_list)
+            self._suffixes = tuple(p.suffix for p in self.test_file_list)
+
+        if len(self.test_file_list) < 256:
+            self._apply_test_rows(self._compute_test_rows(regex_pattern, groups_str, output_format))
+            return
+
+        # 大列表：在daemon线程上计算，完成后回主线程应用；
+        # 期间又有新请求时按代号丢弃过期结果
+        self._compute_generation += 1
+        generation = self._compute_generation
+
+        def _work():
+            rows = self._compute_test_rows(regex_pattern, groups_str, output_format)
+            try:
+                self.frame.after(0, self._apply_if_current, generation, rows)
+            except tk.TclError:
+                pass
+
+        threading.Thread(target=_work, daemon=True).start()
+
+    def _apply_if_current(self, generation: int, rows: List[tuple]):
+        if generation == self._compute_generation:
+            self._apply_test_rows(rows)
+
+    def _parse_groups(self, groups_str: str) -> dict:
+        """解析组映射JSON：先做形状预检，未变时复用上次解析结果"""
+        cached = self._last_groups_parse
+        if cached is not None and cached[0] == groups_str:
+            return cached[1]
+
+        # 形状明显不完整（用户输入中）时直接判错，省掉json解析和异常成本
+        if (not groups_str.startswith('{') or not groups_str.endswith('}')
+                or groups_str.count('{') != groups_str.count('}')):
+            raise json.JSONDecodeError("组映射不是完整的JSON对象", groups_str, 0)
+
+        groups = json.loads(groups_str)
+        if not isinstance(groups, dict):
+            raise ValueError("组映射必须是字典格式")
+        self._last_groups_parse = (groups_str, groups)
+        return groups
+
+    def _compute_test_rows(self, regex_pattern: str, groups_str: str, output_format: str) -> List[tuple]:
+        """根据编辑内容计算文件列表的显示行（不触碰Treeview，可在线程中运行）"""
+        if not self.test_file_list:
+            return []
+
         if not all([regex_pattern, groups_str, output_format]):
             # 如果正则表达式不完整，只显示原文件名
-            for file_path in self.test_file_list:
-                filename = file_path.name
-                self.test_files_tree.insert('', tk.END, values=(
-                    filename, filename, "等待测试", "请完善正则表达式"
-                ))
-            return
-        
+            return [
+                (name, name, "等待测试", "请完善正则表达式")
+                for name in self._names
+            ]
+
         try:
-            # 解析组映射
-            groups = json.loads(groups_str)
-            if not isinstance(groups, dict):
-                raise ValueError("组映射必须是字典格式")
-            
-            # 测试正则表达式
-            compiled_pattern = re.compile(regex_pattern)
-            
+            # 解析组映射（带预检和缓存）
+            groups = self._parse_groups(groups_str)
+
+            # 测试正则表达式（缓存编译，击键间复用）
+            compiled_pattern = _compile(regex_pattern)
+
+            # 循环不变量提到循环外：分组对元组、search/append绑定为局部名
+            group_items = tuple(groups.items())
+            search = compiled_pattern.search
+            # 必然字面子串预过滤：缺少它的文件名无需进正则引擎
+            required_literal = _longest_required_literal(regex_pattern)
+            # 命名分组快速路径：模式的命名分组覆盖全部格式键时，
+            # groupdict + format_map 跳过JSON组映射和kwargs展开
+            fmt_keys = {
+                field for _, field, _, _ in string.Formatter().parse(output_format)
+                if field
+            }
+            named_fast_path = (
+                bool(compiled_pattern.groupindex)
+                and fmt_keys <= set(compiled_pattern.groupindex)
+            )
+            rows = []
+            append_row = rows.append
             # 预览每个文件
-            for file_path in self.test_file_list:
-                filename = file_path.name
-                extension = file_path.suffix
-                
-                # 尝试匹配
-                match = compiled_pattern.search(filename)
-                
+            for filename, extension in zip(self._names, self._suffixes):
+                # 尝试匹配（先做SIMD加速的子串预过滤）
+                if required_literal and required_literal not in filename:
+                    match = None
+                else:
+                    match = search(filename)
+
                 if match:
-                    # 提取匹配信息
-                    match_result = {}
-                    for group_name, group_index in groups.items():
-                        if group_index <= len(match.groups()):
-                            match_result[group_name] = match.group(group_index)
-                        else:
-                            match_result[group_name] = ""
-                    
+                    if named_fast_path:
+                        # C级一次分配的命名分组字典
+                        match_result = match.groupdict(default="")
+                    else:
+                        # 提取匹配信息（groups()取一次元组，按索引读取；
+                        # 0表示整个匹配，越界/负数映射为空串）
+                        m_groups = match.groups()
+                        n_groups = len(m_groups)
+                        match_result = {
+                            name: (m_groups[idx - 1] if 1 <= idx <= n_groups
+                                   else (match.group(0) if idx == 0 else ""))
+                            for name, idx in group_items
+                        }
+
                     # 生成输出文件名
                     try:
-                        new_filename = output_format.format(**match_result) + extension
+                        new_filename = output_format.format_map(match_result) + extension
                         status = "匹配成功"
                         match_info = str(match_result)
                     except KeyError as e:
@@ -413,44 +547,69 @@ class RuleTestingTab:
                     new_filename = filename
                     status = "匹配失败"
                     match_info = "无匹配"
-                
-                self.test_files_tree.insert('', tk.END, values=(
-                    filename, new_filename, status, match_info
-                ))
-                
+
+                append_row((filename, new_filename, status, match_info))
+            return rows
+
         except json.JSONDecodeError:
             # JSON格式错误
-            for file_path in self.test_file_list:
-                filename = file_path.name
-                self.test_files_tree.insert('', tk.END, values=(
-                    filename, filename, "JSON格式错误", "请检查组映射格式"
-                ))
+            return [
+                (name, name, "JSON格式错误", "请检查组映射格式")
+                for name in self._names
+            ]
         except re.error:
             # 正则表达式错误
-            for file_path in self.test_file_list:
-                filename = file_path.name
-                self.test_files_tree.insert('', tk.END, values=(
-                    filename, filename, "正则表达式错误", "请检查正则表达式"
-                ))
+            return [
+                (name, name, "正则表达式错误", "请检查正则表达式")
+                for name in self._names
+            ]
+
+    def _apply_test_rows(self, rows: List[tuple]):
+        """把计算好的行写入Treeview；只更新内容变化的行"""
+        tree = self.test_files_tree
+        if len(rows) == len(self._row_iids):
+            # 行数不变：原位更新，内容相同的行完全跳过
+            for iid, values, last in zip(self._row_iids, rows, self._row_state):
+                if values != last:
+                    tree.item(iid, values=values)
+            self._row_state = rows
+            return
+
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+        self._row_iids = [tree.insert('', tk.END, values=values) for values in rows]
+        self._row_state = rows
     
     def on_test_input_change(self, event=None):
         """测试输入变化事件"""
-        self.run_regex_test()
-    
+        self._schedule_refresh(update_files=False)
+
     def on_regex_change(self, event=None):
         """正则表达式变化事件"""
-        self.run_regex_test()
-        self.update_test_files_display()
-    
+        self._schedule_refresh()
+
     def on_groups_change(self, event=None):
         """组映射变化事件"""
-        self.run_regex_test()
-        self.update_test_files_display()
-    
+        self._schedule_refresh()
+
     def on_format_change(self, event=None):
         """输出格式变化事件"""
+        self._schedule_refresh()
+
+    def _schedule_refresh(self, update_files: bool = True, delay_ms: int = 180):
+        """防抖调度测试刷新：取消未执行的刷新，只保留最后一次"""
+        self._refresh_files_pending = self._refresh_files_pending or update_files
+        if self._pending_job is not None:
+            self.frame.after_cancel(self._pending_job)
+        self._pending_job = self.frame.after(delay_ms, self._do_refresh)
+
+    def _do_refresh(self):
+        self._pending_job = None
         self.run_regex_test()
-        self.update_test_files_display()
+        if self._refresh_files_pending:
+            self._refresh_files_pending = False
+            self.update_test_files_display()
     
     def run_regex_test(self):
         """运行正则表达式测试"""
@@ -478,13 +637,11 @@ class RuleTestingTab:
             return
         
         try:
-            # 解析组映射
-            groups = json.loads(groups_str)
-            if not isinstance(groups, dict):
-                raise ValueError("组映射必须是字典格式")
-            
-            # 测试正则表达式
-            compiled_pattern = re.compile(regex_pattern)
+            # 解析组映射（带预检和缓存）
+            groups = self._parse_groups(groups_str)
+
+            # 测试正则表达式（缓存编译，击键间复用）
+            compiled_pattern = _compile(regex_pattern)
             match = compiled_pattern.search(filename)
             
             if match:
@@ -556,7 +713,7 @@ class RuleTestingTab:
                 raise ValueError("组映射必须是字典格式")
             
             # 测试正则表达式
-            re.compile(pattern)
+            _compile(pattern)
             
             # 创建规则
             rule = RegexRule(name, pattern, groups, output_format)
@@ -584,23 +741,20 @@ class RuleTestingTab:
         columns = [self.test_files_tree.heading(col)['text'] for col in self.test_files_tree['columns']]
         
         # 构建复制内容
-        copy_content = []
-        for item_id in selection:
-            item = self.test_files_tree.item(item_id)
-            values = item['values']
-            # 将列标题和值组合成键值对
-            row_data = []
-            for i, value in enumerate(values):
-                if i < len(columns):
-                    row_data.append(f"{columns[i]}: {value}")
-            copy_content.append(" | ".join(row_data))
+        copy_content = [
+            " | ".join(
+                f"{col}: {value}"
+                for col, value in zip(columns, self.test_files_tree.item(item_id, 'values'))
+            )
+            for item_id in selection
+        ]
         
         # 复制到剪贴板
         copy_text = "\n".join(copy_content)
         parent = self.parent_notebook.winfo_toplevel()
         parent.clipboard_clear()
         parent.clipboard_append(copy_text)
-        parent.update()  # 确保剪贴板更新
+        parent.update_idletasks()  # 刷新空闲任务即可让Tk接管剪贴板
         
         messagebox.showinfo("成功", f"已复制 {len(selection)} 行到剪贴板")
     
@@ -615,23 +769,20 @@ class RuleTestingTab:
         columns = [self.test_files_tree.heading(col)['text'] for col in self.test_files_tree['columns']]
         
         # 构建复制内容
-        copy_content = []
-        for item_id in items:
-            item = self.test_files_tree.item(item_id)
-            values = item['values']
-            # 将列标题和值组合成键值对
-            row_data = []
-            for i, value in enumerate(values):
-                if i < len(columns):
-                    row_data.append(f"{columns[i]}: {value}")
-            copy_content.append(" | ".join(row_data))
+        copy_content = [
+            " | ".join(
+                f"{col}: {value}"
+                for col, value in zip(columns, self.test_files_tree.item(item_id, 'values'))
+            )
+            for item_id in items
+        ]
         
         # 复制到剪贴板
         copy_text = "\n".join(copy_content)
         parent = self.parent_notebook.winfo_toplevel()
         parent.clipboard_clear()
         parent.clipboard_append(copy_text)
-        parent.update()  # 确保剪贴板更新
+        parent.update_idletasks()  # 刷新空闲任务即可让Tk接管剪贴板
         
         messagebox.showinfo("成功", f"已复制 {len(items)} 行到剪贴板")
     
@@ -657,22 +808,17 @@ class RuleTestingTab:
         copy_content.append(separator)
         
         # 添加数据行
-        for item_id in items:
-            item = self.test_files_tree.item(item_id)
-            values = item['values']
-            # 直接使用值，不添加列标题
-            row_data = []
-            for i, value in enumerate(values):
-                if i < len(columns):
-                    row_data.append(str(value))
-            copy_content.append(" | ".join(row_data))
+        copy_content.extend(
+            " | ".join(str(value) for value in self.test_files_tree.item(item_id, 'values'))
+            for item_id in items
+        )
         
         # 复制到剪贴板
         copy_text = "\n".join(copy_content)
         parent = self.parent_notebook.winfo_toplevel()
         parent.clipboard_clear()
         parent.clipboard_append(copy_text)
-        parent.update()  # 确保剪贴板更新
+        parent.update_idletasks()  # 刷新空闲任务即可让Tk接管剪贴板
         
         messagebox.showinfo("成功", f"已复制 {len(items)} 行（含表头）到剪贴板")
     
@@ -683,10 +829,9 @@ class RuleTestingTab:
         self.test_groups_var.set(TEST_DEFAULT_GROUPS)
         self.test_format_var.set(TEST_DEFAULT_FORMAT)
         self.test_result_text.delete(1.0, tk.END)
-        
+
         # 清空文件列表
-        for item in self.test_files_tree.get_children():
-            self.test_files_tree.delete(item)
+        self._apply_test_rows([])
     
     def auto_match_test(self):
         """自动匹配测试"""
@@ -716,13 +861,11 @@ class RuleTestingTab:
     
     def update_test_files_display_with_auto_match(self, auto_results):
         """更新测试文件列表显示（带自动匹配结果）"""
-        # 清空现有项目
-        for item in self.test_files_tree.get_children():
-            self.test_files_tree.delete(item)
-        
         if not self.test_file_list:
+            self._apply_test_rows([])
             return
-        
+
+        rows = []
         for file_path in self.test_file_list:
             filename = file_path.name
             extension = file_path.suffix
@@ -753,10 +896,10 @@ class RuleTestingTab:
                 new_filename = filename
                 status = "无自动匹配"
                 match_info = "建议手动测试"
-            
-            self.test_files_tree.insert('', tk.END, values=(
-                filename, new_filename, status, match_info
-            ))
+
+            rows.append((filename, new_filename, status, match_info))
+
+        self._apply_test_rows(rows)
     
     def update_rules(self, new_rules: List[RegexRule]):
         """更新规则列表"""
@@ -5,51 +5,139 @@
 负责代码热重载和文件监控功能
 """
 
+import os
+import queue
+import re
 import sys
 import importlib
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import Callable, Deque, List, Optional
 
 # 可选依赖
 try:
     from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
+    from watchdog.events import PatternMatchingEventHandler
     WATCHDOG_AVAILABLE = True
+    # 旧版watchdog没有关闭事件，此时不能忽略modified事件
+    try:
+        from watchdog.events import FileClosedEvent  # noqa: F401
+        WATCHDOG_HAS_CLOSE_EVENTS = True
+    except ImportError:
+        WATCHDOG_HAS_CLOSE_EVENTS = False
 except ImportError:
     WATCHDOG_AVAILABLE = False
+    WATCHDOG_HAS_CLOSE_EVENTS = False
     print("警告: watchdog库未安装，热重载功能将被禁用")
     # 创建一个空的基类作为替代
-    class FileSystemEventHandler:
-        """空的基类，用于替代watchdog的FileSystemEventHandler"""
-        pass
+    class PatternMatchingEventHandler:
+        """空的基类，用于替代watchdog的PatternMatchingEventHandler"""
+        def __init__(self, *args, **kwargs):
+            pass
 
 from libs.config import RELOAD_COOLDOWN, MAX_RELOAD_LOG_ENTRIES
 
+# watchdog不可用时mtime轮询回退的扫描间隔（秒）
+POLL_INTERVAL = 1.0
+
+# 这些目录里的.py事件（字节码写入、VCS/IDE临时文件）不应触发重载
+_IGNORED_DIRS_RX = re.compile(r'[\\/](?:__pycache__|\.git|\.idea|\.?venv|node_modules)[\\/]')
+
+# 监控根（libs/）与包根目录：模块级常量，控制路径上不再重复解析
+_LIBS_ROOT = str(Path(__file__).resolve().parent.parent)
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class CodeReloadHandler(PatternMatchingEventHandler):
+    """代码热重载处理器
+
+    过滤下放到watchdog的分发层：只接收*.py，忽略编译产物和编辑器临时
+    文件。采用尾沿防抖：每个事件只（重新）安排一次定时器，安静期满后
+    才触发一次重载，把一批保存（git pull、格式化保存）合并成一次且不
+    丢尾部事件。
+    """
 
-class CodeReloadHandler(FileSystemEventHandler):
-    """代码热重载处理器"""
-    
     def __init__(self, reload_callback: Callable):
+        super().__init__(
+            patterns=['*.py'],
+            ignore_patterns=['*/__pycache__/*', '*.pyc', '.*', '*~', '*.swp', '*.swx'],
+            ignore_directories=True,
+            case_sensitive=True
+        )
         self.reload_callback = reload_callback
-        self.last_reload_time = 0
-        self.reload_cooldown = RELOAD_COOLDOWN
-    
-    def on_modified(self, event):
-        """文件修改事件处理"""
-        if event.is_directory or not event.src_path.endswith('.py'):
+        self.debounce_seconds = RELOAD_COOLDOWN
+        self._lock = threading.Lock()
+        self._pending_paths = set()
+        self._pending_timer: Optional[threading.Timer] = None
+        # 触发间隔下限用monotonic纳秒死线表示：整数比较，不受NTP回拨影响
+        self._cooldown_ns = int(RELOAD_COOLDOWN * 1e9)
+        self._next_ok_ns = 0
+
+    # Linux的inotify按每次保存派发多个IN_MODIFY；改听CLOSE_WRITE
+    # （写入完成）可以一次保存只触发一次。要求watchdog支持关闭事件，
+    # 否则必须继续响应modified
+    _prefer_close_write = (sys.platform.startswith('linux')
+                           and WATCHDOG_HAS_CLOSE_EVENTS)
+
+    def _queue_event(self, path: str):
+        """记录一个待处理路径并（重新）安排防抖定时器"""
+        # 缓存目录/版本库临时文件直接丢弃，不占用防抖调度
+        if _IGNORED_DIRS_RX.search(path):
             return
-        
-        current_time = time.time()
-        if current_time - self.last_reload_time < self.reload_cooldown:
+        # 规范化并驻留：同一文件的 IN_MODIFY/IN_CLOSE_WRITE 等多个事件
+        # 在集合里折叠为同一个字符串对象
+        path = sys.intern(os.path.normcase(path))
+        with self._lock:
+            self._pending_paths.add(path)
+            # 尾沿防抖：有新事件就推迟触发
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(self.debounce_seconds, self._flush)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+
+    def _flush(self):
+        """安静期满：把积累的事件作为一批触发一次重载"""
+        now = time.monotonic_ns()
+        with self._lock:
+            if now < self._next_ok_ns:
+                # 距上次触发过近：保留事件，推迟到冷却结束
+                remaining = (self._next_ok_ns - now) / 1e9
+                self._pending_timer = threading.Timer(remaining, self._flush)
+                self._pending_timer.daemon = True
+                self._pending_timer.start()
+                return
+            paths = self._pending_paths
+            self._pending_paths = set()
+            self._pending_timer = None
+            self._next_ok_ns = now + self._cooldown_ns
+        if paths:
+            self.reload_callback(sorted(paths))
+
+    def on_modified(self, event):
+        """文件修改事件处理（分发层已按模式过滤）"""
+        # Linux上忽略写入中途的modified，等对应的closed事件
+        if self._prefer_close_write:
             return
-        
-        self.last_reload_time = current_time
-        self.reload_callback()
-    
+        self._queue_event(event.src_path)
+
+    def on_closed(self, event):
+        """文件写入完成事件（Linux inotify CLOSE_WRITE）"""
+        self._queue_event(event.src_path)
+
     def on_created(self, event):
         """文件创建事件处理"""
-        self.on_modified(event)
+        if self._prefer_close_write:
+            return
+        self._queue_event(event.src_path)
+
+    def on_moved(self, event):
+        """文件移动事件处理（编辑器原子保存只产生moved事件）"""
+        dest_path = getattr(event, 'dest_path', '') or ''
+        if dest_path.endswith('.py'):
+            self._queue_event(dest_path)
 
 
 class HotReloadManager:
@@ -58,12 +146,42 @@ class HotReloadManager:
     def __init__(self):
         self.file_observer: Optional[Observer] = None
         self.reload_enabled = True
-        self.reload_log: List[str] = []
+        # 有界deque自动丢弃最老的条目，长会话内存和渲染成本有上界
+        self.reload_log: Deque[str] = deque(maxlen=MAX_RELOAD_LOG_ENTRIES)
         self.reload_callback: Optional[Callable] = None
-    
+        self._log_observers: List[Callable[[str], None]] = []
+        # 同一秒内的日志共用一次strftime结果
+        self._ts_sec = 0
+        self._ts_str = ""
+        # 预绑定的日志行格式化方法
+        self._format_entry = "[{ts}] {lvl}: {msg}".format
+        # 模块源文件的(mtime, size)指纹：未变化的模块跳过importlib.reload
+        self._mtime_cache: dict = {}
+        # watchdog不可用时的轮询回退线程
+        self._poll_thread: Optional[threading.Thread] = None
+        self._poll_stop: Optional[threading.Event] = None
+        # 事件批次队列：监控线程只入队即返回，重载在独立工作线程执行
+        self._event_q: Optional[queue.SimpleQueue] = None
+        self._drain_thread: Optional[threading.Thread] = None
+        # 控制台输出缓冲：日志风暴时按防抖窗口合并写stdout
+        self._out_buf: List[str] = []
+        self._out_lock = threading.Lock()
+        self._out_timer: Optional[threading.Timer] = None
+
     def set_reload_callback(self, callback: Callable):
         """设置重载回调函数"""
         self.reload_callback = callback
+
+    def add_log_observer(self, observer: Callable[[str], None]):
+        """注册日志观察者，新日志产生时立即收到通知"""
+        self._log_observers.append(observer)
+
+    def remove_log_observer(self, observer: Callable[[str], None]):
+        """注销日志观察者（界面销毁时调用，避免残留死回调）"""
+        try:
+            self._log_observers.remove(observer)
+        except ValueError:
+            pass
     
     def start_file_monitoring(self):
         """启动文件监控"""
@@ -71,17 +189,27 @@ class HotReloadManager:
             return
         
         if not WATCHDOG_AVAILABLE:
-            self.add_reload_log("watchdog库未安装，热重载功能不可用", "WARNING")
+            # 退化为轻量mtime轮询，保证没有watchdog时仍有热重载
+            self._start_poll_fallback()
             return
         
+        # Observer是长生命周期单例：已在运行则无需重建，
+        # 反复toggle不再重复安装inotify监视
+        if self.file_observer is not None and self.file_observer.is_alive():
+            return
+
         try:
-            # 获取当前脚本所在目录
-            current_dir = Path(__file__).parent.parent.absolute()
-            
+            # 事件批次经队列转交给独立的重载工作线程，
+            # 监控/防抖线程入队后立刻返回，不会被耗时的重载阻塞
+            if self._drain_thread is None or not self._drain_thread.is_alive():
+                self._event_q = queue.SimpleQueue()
+                self._drain_thread = threading.Thread(target=self._drain_events, daemon=True)
+                self._drain_thread.start()
+
             # 创建文件监控器
             self.file_observer = Observer()
-            handler = CodeReloadHandler(self.reload_callback)
-            self.file_observer.schedule(handler, str(current_dir), recursive=True)
+            handler = CodeReloadHandler(self._event_q.put)
+            self.file_observer.schedule(handler, _LIBS_ROOT, recursive=True)
             
             # 启动监控
             self.file_observer.start()
@@ -92,6 +220,65 @@ class HotReloadManager:
         except Exception as e:
             self.add_reload_log(f"启动文件监控失败: {e}", "ERROR")
     
+    def _drain_events(self):
+        """工作线程：从事件队列取出批次并执行重载回调"""
+        while True:
+            paths = self._event_q.get()
+            if paths is None:  # 关闭哨兵
+                return
+            if not self.reload_enabled or not self.reload_callback:
+                continue
+            try:
+                self.reload_callback(paths)
+            except Exception as e:
+                self.add_reload_log(f"重载回调失败: {e}", "ERROR")
+
+    def _start_poll_fallback(self):
+        """启动mtime轮询回退线程（watchdog不可用时）"""
+        if self._poll_thread is not None and self._poll_thread.is_alive():
+            return
+        self._poll_stop = threading.Event()
+        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._poll_thread.start()
+        self.add_reload_log("watchdog库未安装，已启用轮询监控", "INFO")
+
+    def _poll_loop(self):
+        """轮询回退：scandir递归扫描.py文件的mtime，变化时触发重载回调"""
+        root = _LIBS_ROOT
+        known: dict = {}
+        first_pass = True
+        while not self._poll_stop.is_set():
+            changed = []
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name != '__pycache__':
+                                    stack.append(entry.path)
+                            elif entry.name.endswith('.py'):
+                                try:
+                                    mtime = entry.stat().st_mtime_ns
+                                except OSError:
+                                    continue
+                                if known.get(entry.path) != mtime:
+                                    known[entry.path] = mtime
+                                    if not first_pass:
+                                        changed.append(entry.path)
+                except OSError:
+                    continue
+
+            if changed and self.reload_enabled and self.reload_callback:
+                try:
+                    self.reload_callback(sorted(changed))
+                except Exception as e:
+                    self.add_reload_log(f"轮询重载失败: {e}", "ERROR")
+
+            first_pass = False
+            self._poll_stop.wait(POLL_INTERVAL)
+
     def stop_file_monitoring(self):
         """停止文件监控"""
         if self.file_observer:
@@ -99,36 +286,87 @@ class HotReloadManager:
             self.file_observer.join()
             self.file_observer = None
             self.add_reload_log("文件监控已停止", "INFO")
+        if self._poll_stop is not None:
+            self._poll_stop.set()
+            self._poll_thread = None
+        if self._event_q is not None:
+            self._event_q.put(None)
+            self._drain_thread = None
     
     def add_reload_log(self, message: str, level: str = "INFO"):
         """添加重载日志"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}"
+        # 事件风暴下同一秒会产生大量日志，strftime每秒只算一次
+        now = int(time.time())
+        if now != self._ts_sec:
+            self._ts_sec = now
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+        log_entry = self._format_entry(ts=self._ts_str, lvl=level, msg=message)
+        # deque(maxlen=...) 自动丢弃最老的条目
         self.reload_log.append(log_entry)
-        
-        # 保持日志数量在合理范围内
-        if len(self.reload_log) > MAX_RELOAD_LOG_ENTRIES:
-            self.reload_log = self.reload_log[-MAX_RELOAD_LOG_ENTRIES:]
-        
-        print(log_entry)  # 同时输出到控制台
+
+        # 控制台输出走缓冲：50ms窗口内的日志合并为一次write+flush
+        with self._out_lock:
+            self._out_buf.append(log_entry)
+            if self._out_timer is None:
+                self._out_timer = threading.Timer(0.05, self._flush_stdout)
+                self._out_timer.daemon = True
+                self._out_timer.start()
+
+        # 通知观察者（可能在watchdog线程上执行，观察者自行转主线程）
+        for observer in self._log_observers:
+            try:
+                observer(log_entry)
+            except Exception:
+                pass
     
+    def _flush_stdout(self):
+        """把缓冲的日志行一次性写到控制台"""
+        with self._out_lock:
+            lines = self._out_buf
+            self._out_buf = []
+            self._out_timer = None
+        if lines:
+            try:
+                sys.stdout.write("\n".join(lines) + "\n")
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
     def clear_reload_log(self):
         """清空重载日志"""
         self.reload_log.clear()
         self.add_reload_log("日志已清空", "INFO")
     
     def toggle_reload(self, enabled: bool):
-        """切换热重载状态"""
+        """切换热重载状态
+
+        观察者保持运行（重装inotify监视开销不小），禁用状态由
+        工作线程在分发前检查，开关本身近乎零成本。
+        """
         self.reload_enabled = enabled
         if enabled:
+            # 首次启用（或观察者尚未创建）时才真正启动
             self.start_file_monitoring()
             self.add_reload_log("热重载已启用", "INFO")
         else:
-            self.stop_file_monitoring()
             self.add_reload_log("热重载已禁用", "INFO")
+
+    def shutdown(self):
+        """进程退出前的最终清理：停掉监控并冲刷缓冲日志"""
+        self.stop_file_monitoring()
+        self._flush_stdout()
     
-    def manual_reload(self, module_name: str = None):
-        """手动触发重载"""
+    def manual_reload(self, module_name: str = None, paths=None):
+        """手动触发重载
+
+        Args:
+            module_name: 单个模块名（旧接口）
+            paths: 变更文件路径集合，去重映射到模块后批量重载
+        """
+        if paths is not None:
+            self._reload_changed_paths(paths)
+            return
+
         self.add_reload_log("手动触发重载", "INFO")
         
         if module_name and module_name != "__main__":
@@ -142,3 +380,68 @@ class HotReloadManager:
                 self.add_reload_log(f"重载模块 {module_name} 失败: {e}", "ERROR")
         else:
             self.add_reload_log("跳过主模块重载", "INFO")
+
+    def _reload_changed_paths(self, paths):
+        """把一批变更路径映射为模块集合并逐个重载（每个模块只重载一次）"""
+        module_names = set()
+        for path in paths:
+            try:
+                relative = Path(path).resolve().relative_to(_PACKAGE_ROOT)
+            except (OSError, ValueError):
+                continue
+            module_names.add(relative.with_suffix('').as_posix().replace('/', '.'))
+
+        # 依赖排序：被依赖的模块先重载，引用方随后重载才能拿到新对象。
+        # 依赖边来自模块字典里对同批候选模块的引用（import x 形式）。
+        from graphlib import CycleError, TopologicalSorter
+        from types import ModuleType
+
+        candidates = {name for name in module_names if name in sys.modules}
+        graph = {}
+        for name in candidates:
+            dependencies = set()
+            for value in vars(sys.modules[name]).values():
+                if (isinstance(value, ModuleType)
+                        and value.__name__ in candidates
+                        and value.__name__ != name):
+                    dependencies.add(value.__name__)
+            graph[name] = dependencies
+        try:
+            ordered = list(TopologicalSorter(graph).static_order())
+        except CycleError:
+            ordered = sorted(candidates)
+
+        reloaded = 0
+        skipped = 0
+        for name in ordered:
+            module = sys.modules.get(name)
+            if module is None:
+                continue
+
+            # 源文件指纹未变（如编辑器只碰了mtime事件没改内容、或
+            # 二次触发）时跳过昂贵的reload
+            module_file = getattr(module, '__file__', None)
+            fingerprint = None
+            if module_file:
+                try:
+                    st = os.stat(module_file)
+                    fingerprint = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    fingerprint = None
+            if fingerprint is not None and self._mtime_cache.get(name) == fingerprint:
+                skipped += 1
+                continue
+
+            try:
+                importlib.reload(module)
+                reloaded += 1
+                if fingerprint is not None:
+                    self._mtime_cache[name] = fingerprint
+            except Exception as e:
+                self.add_reload_log(f"重载模块 {name} 失败: {e}", "ERROR")
+
+        self.add_reload_log(
+            f"批量重载完成: {reloaded}/{len(module_names)} 个模块"
+            + (f"（{skipped} 个未变化跳过）" if skipped else ""),
+            "INFO"
+        )